@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Location, Post
+from .models import Category, Comment, ImageJob, Location, MediaBlob, Post
 
 
 @admin.register(Post)
@@ -62,3 +62,24 @@ class CommentAdmin(admin.ModelAdmin):
     search_fields = ('post__id',)
     list_filter = ('post',)
     list_display_links = ('post',)
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'source',
+        'post',
+        'status',
+        'attempts',
+        'created_at',
+        'claimed_at',
+        'finished_at'
+    )
+    list_filter = ('status',)
+    list_display_links = ('source',)
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'ref_count', 'created_at')
+    search_fields = ('name',)
@@ -0,0 +1,6 @@
+# Настройка CACHES для замеров без кеширования фрагментов и страниц.
+DUMMY_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }
+}
@@ -0,0 +1,247 @@
+from collections import namedtuple
+from contextlib import contextmanager
+from hashlib import md5
+from time import sleep, time, time_ns
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.constants import (
+    PAGE_CACHE_TIMEOUT,
+    PAGE_LOCK_TIMEOUT,
+    PAGE_LOCK_WAIT,
+    PAGE_LOCK_WAIT_INTERVAL,
+    PAGE_STALE_TIMEOUT)
+
+GENERATION_KEY = 'blog:generation:{}'
+GENERATION_CHANGED_KEY = 'blog:generation-changed:{}'
+PAGE_KEY = 'blog:page:{}:{}'
+STALE_PAGE_KEY = 'blog:stale-page:{}'
+LOCK_KEY = 'blog:lock:{}'
+LAST_MODIFIED_KEY = 'blog:last-modified:{}:{}'
+METRIC_KEY = 'blog:page-cache:{}'
+
+PAGE_CACHE_METRICS = ('hit', 'miss', 'stale', 'regeneration')
+
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+PageEntry = namedtuple('PageEntry', ('versions', 'fresh_until', 'response'))
+
+
+def get_generation(name):
+    """Текущее поколение данных с именем name.
+
+    Начальное значение берётся от времени, чтобы после вытеснения
+    счётчика из кеша не вернулись записи старого поколения.
+    """
+    key = GENERATION_KEY.format(name)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(*names):
+    changed_at = timezone.now()
+    for name in names:
+        key = GENERATION_KEY.format(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time_ns(), None)
+    cache.set_many(
+        {GENERATION_CHANGED_KEY.format(name): changed_at for name in names},
+        None
+    )
+
+
+def get_generations_changed_at(generations):
+    """Когда последний раз менялось любое из поколений generations.
+
+    Удаление или снятие с публикации не оставляет следа в датах
+    оставшихся записей, а время смены поколения его отражает.
+    """
+    return max(
+        cache.get_many(
+            [GENERATION_CHANGED_KEY.format(name) for name in generations]
+        ).values(),
+        default=None
+    )
+
+
+def page_cache_enabled():
+    return getattr(settings, 'BLOG_PAGE_CACHE_ENABLED', False)
+
+
+def get_versions(generations):
+    return '.'.join(str(get_generation(name)) for name in generations)
+
+
+def get_page_key(request, generations, key_format=PAGE_KEY):
+    """Ключ страницы: адрес запроса и текущие поколения её данных."""
+    url = md5(request.get_full_path().encode()).hexdigest()
+    return key_format.format(get_versions(generations), url)
+
+
+def get_cached_last_modified(request, generations, compute):
+    """Время изменения страницы, хранимое не дольше самой страницы."""
+    return cache.get_or_set(
+        get_page_key(request, generations, LAST_MODIFIED_KEY),
+        compute,
+        PAGE_CACHE_TIMEOUT
+    )
+
+
+def get_cached_page(key):
+    return cache.get(key)
+
+
+def on_rendered(response, callback):
+    """Вызывает callback с ответом, когда у него появится содержимое."""
+    if getattr(response, 'is_rendered', True):
+        callback(response)
+    else:
+        response.add_post_render_callback(callback)
+
+
+def strip_validators(response):
+    """Убирает ETag и Last-Modified, возвращает их прежние значения.
+
+    Страница из общего кеша достаётся разным посетителям, а валидаторы
+    у каждого свои: их выставляет ConditionalGetMixin для запроса.
+    """
+    removed = {
+        header: response[header]
+        for header in VALIDATOR_HEADERS if response.has_header(header)
+    }
+    for header in removed:
+        del response[header]
+    return removed
+
+
+@contextmanager
+def without_validators(response):
+    """Ответ без валидаторов на время записи в кеш."""
+    removed = strip_validators(response)
+    try:
+        yield response
+    finally:
+        for header, value in removed.items():
+            response[header] = value
+
+
+def cache_page(key, response):
+    if response.status_code != 200:
+        return
+
+    def store(rendered):
+        with without_validators(rendered):
+            cache.set(key, rendered, PAGE_CACHE_TIMEOUT)
+
+    on_rendered(response, store)
+
+
+def stale_while_revalidate_enabled():
+    return getattr(settings, 'BLOG_PAGE_CACHE_STALE_WHILE_REVALIDATE', False)
+
+
+def get_stale_page_key(request):
+    """Ключ страницы без поколений: устаревшая копия остаётся доступной."""
+    url = md5(request.get_full_path().encode()).hexdigest()
+    return STALE_PAGE_KEY.format(url)
+
+
+def is_fresh(entry, versions):
+    return entry.versions == versions and entry.fresh_until > time()
+
+
+def acquire_lock(key):
+    """Только один запрос получает право пересобрать страницу key.
+
+    Возвращает метку владельца блокировки или None, если блокировка
+    уже у другого запроса.
+    """
+    token = uuid4().hex
+    if cache.add(LOCK_KEY.format(key), token, PAGE_LOCK_TIMEOUT):
+        return token
+    return None
+
+
+def release_lock(key, token):
+    """Снимает блокировку, только если она всё ещё принадлежит token.
+
+    Блокировка могла истечь и перейти к другому запросу.
+    """
+    if token is not None and cache.get(LOCK_KEY.format(key)) == token:
+        cache.delete(LOCK_KEY.format(key))
+
+
+def wait_for_page(key):
+    """Ждёт, пока владелец блокировки сохранит страницу, которой нет."""
+    deadline = time() + PAGE_LOCK_WAIT
+    while time() < deadline:
+        sleep(PAGE_LOCK_WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def discard_page_entry(key, token):
+    """Удаляет устаревшую копию, если новую страницу сохранить нельзя.
+
+    Иначе копию продолжали бы отдавать, пока идёт следующая пересборка,
+    например, уже снятой с публикации записи.
+    """
+    if token is not None:
+        cache.delete(key)
+    release_lock(key, token)
+
+
+def store_page_entry(key, versions, response, token):
+    """Сохраняет страницу вместе с поколениями и сроком свежести.
+
+    Запись живёт в кеше дольше срока свежести на PAGE_STALE_TIMEOUT,
+    чтобы её можно было отдавать, пока страница пересобирается.
+    """
+    if response.status_code != 200:
+        discard_page_entry(key, token)
+        return
+
+    def store(rendered):
+        with without_validators(rendered):
+            cache.set(
+                key,
+                PageEntry(versions, time() + PAGE_CACHE_TIMEOUT, rendered),
+                PAGE_CACHE_TIMEOUT + PAGE_STALE_TIMEOUT
+            )
+        release_lock(key, token)
+
+    on_rendered(response, store)
+
+
+def count_metric(name):
+    key = METRIC_KEY.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def get_metrics():
+    values = cache.get_many(
+        [METRIC_KEY.format(name) for name in PAGE_CACHE_METRICS]
+    )
+    return {
+        name: values.get(METRIC_KEY.format(name), 0)
+        for name in PAGE_CACHE_METRICS
+    }
+
+
+def reset_metrics():
+    cache.delete_many(
+        [METRIC_KEY.format(name) for name in PAGE_CACHE_METRICS]
+    )
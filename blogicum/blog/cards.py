@@ -0,0 +1,97 @@
+from collections import namedtuple
+
+from django.db.models.query import ValuesListIterable
+
+from blog.images import ResponsiveImage, is_image_pending
+from blog.storage import image_storage
+
+CardAuthor = namedtuple('CardAuthor', ('username',))
+CardCategory = namedtuple('CardCategory', ('slug', 'title', 'is_published'))
+CardLocation = namedtuple('CardLocation', ('name', 'is_published'))
+
+
+class CardImage:
+    """Файл изображения карточки: только имя и адрес."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def url(self):
+        return image_storage.url(self.name)
+
+
+class PostCard:
+    """Данные поста, которые нужны карточке в ленте.
+
+    Создаётся из строки values_list() без экземпляров моделей.
+    """
+
+    fields = (
+        'id', 'title', 'excerpt', 'pub_date', 'is_published',
+        'comment_count', 'updated_at', 'image', 'image_variants',
+        'author__username', 'category__slug', 'category__title',
+        'category__is_published', 'location__name', 'location__is_published',
+    )
+    __slots__ = (
+        'id', 'title', 'excerpt', 'pub_date', 'is_published',
+        'comment_count', 'updated_at', 'image', 'image_variants', 'author',
+        'category', 'location',
+    )
+
+    def __init__(self, id, title, excerpt, pub_date, is_published,
+                 comment_count, updated_at, image, image_variants,
+                 author_username, category_slug, category_title,
+                 category_is_published, location_name, location_is_published):
+        self.id = id
+        self.title = title
+        self.excerpt = excerpt
+        self.pub_date = pub_date
+        self.is_published = is_published
+        self.comment_count = comment_count
+        self.updated_at = updated_at
+        self.image = CardImage(image) if image else None
+        self.image_variants = image_variants
+        self.author = CardAuthor(author_username)
+        self.category = (
+            None if category_slug is None else CardCategory(
+                category_slug, category_title, category_is_published
+            )
+        )
+        self.location = (
+            None if location_name is None else CardLocation(
+                location_name, location_is_published
+            )
+        )
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def responsive_image(self):
+        return ResponsiveImage.from_variants(
+            self.image and self.image.name, self.image_variants
+        )
+
+    @property
+    def image_pending(self):
+        return is_image_pending(
+            self.image and self.image.name, self.image_variants
+        )
+
+    def __repr__(self):
+        return f'<PostCard: {self.id}>'
+
+
+class PostCardIterable(ValuesListIterable):
+    """Превращает строки выборки в объекты PostCard."""
+
+    def __iter__(self):
+        for row in super().__iter__():
+            yield PostCard(*row)
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+from django.template import engines
+
+
+@register()
+def check_template_engine(app_configs, **kwargs):
+    """BLOG_TEMPLATE_ENGINE указывает на подключённый движок шаблонов."""
+    engine = getattr(settings, 'BLOG_TEMPLATE_ENGINE', None)
+    if engine is None or engine in engines:
+        return []
+    return [Error(
+        f'BLOG_TEMPLATE_ENGINE = {engine!r}, но такого движка нет в '
+        'TEMPLATES.',
+        hint='Для jinja2 установите пакет Jinja2 из requirements.txt.',
+        id='blog.E001',
+    )]
+
+
+# Бэкенды, у которых cache.add() не атомарен между процессами.
+NON_ATOMIC_ADD_BACKENDS = (
+    'django.core.cache.backends.filebased.FileBasedCache',
+)
+
+
+@register()
+def check_page_lock_cache(app_configs, **kwargs):
+    """Блокировке пересборки страниц нужен кеш с атомарным add()."""
+    if not getattr(settings, 'BLOG_PAGE_CACHE_STALE_WHILE_REVALIDATE', False):
+        return []
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in NON_ATOMIC_ADD_BACKENDS:
+        return []
+    return [Warning(
+        f'Бэкенд кеша {backend} не гарантирует атомарный add(): '
+        'страницу могут пересобирать сразу несколько запросов.',
+        hint='Используйте memcached или redis.',
+        id='blog.W001',
+    )]
@@ -1,3 +1,27 @@
 TEXT_RESTRICTION: int = 30
 NUMBER_OF_POSTS: int = 5
 PAGINATION: int = 10
+PAGE_RANGE_ON_EACH_SIDE: int = 2
+PAGE_RANGE_ON_ENDS: int = 1
+FEED_COUNT_CACHE_TIMEOUT: int = 60 * 5
+PAGE_CACHE_TIMEOUT: int = 60 * 5
+PAGE_STALE_TIMEOUT: int = 60 * 10
+PAGE_LOCK_TIMEOUT: int = 30
+PAGE_LOCK_WAIT: float = 2.0
+PAGE_LOCK_WAIT_INTERVAL: float = 0.05
+FEED_MAX_AGE: int = 60
+POST_MAX_AGE: int = 60 * 5
+EXCERPT_WORDS: int = 10
+EXCERPT_MAX_LENGTH: int = 256
+IMAGE_WIDTHS: tuple = (320, 640, 1280)
+IMAGE_VARIANTS_DIR: str = 'blogicum_images/variants'
+IMAGE_JPEG_QUALITY: int = 85
+IMAGE_WEBP_QUALITY: int = 80
+IMAGE_JOB_ATTEMPTS: int = 3
+IMAGE_JOB_TIMEOUT: int = 60 * 10
+IMAGE_UPLOAD_MAX_SIZE: int = 20 * 2 ** 20
+IMAGE_MAX_PIXELS: int = 40_000_000
+IMAGE_UPLOAD_FORMATS: tuple = ('JPEG', 'PNG', 'GIF', 'WEBP')
+MEDIA_MAX_AGE: int = 60 * 60 * 24
+MEDIA_IMMUTABLE_MAX_AGE: int = 60 * 60 * 24 * 365
+MEDIA_CHUNK_SIZE: int = 64 * 2 ** 10
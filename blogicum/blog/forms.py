@@ -1,6 +1,7 @@
 from django import forms
 
 from .models import Comment, Post
+from .uploads import ImageUploadField
 
 
 class PostForm(forms.ModelForm):
@@ -12,6 +13,7 @@ class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ('author',)
+        field_classes = {'image': ImageUploadField}
 
 
 class CommentForm(forms.ModelForm):
@@ -0,0 +1,62 @@
+import re
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from blog.forms import CommentForm
+
+FRAGMENTS_HEADER = 'X-Blog-Fragments'
+FRAGMENT_TEMPLATE = 'includes/fragments/{}.html'
+MARKER = '<!--fragment:{}{}-->'
+MARKER_RE = re.compile(r'<!--fragment:(\w+)((?: \w+=[\w-]+)*)-->')
+VALUE_RE = re.compile(r'[\w-]+')
+
+# Данные фрагментов, которые не передаются в метке.
+FRAGMENT_CONTEXTS = {
+    'comment_form': lambda: {'form': CommentForm()},
+}
+
+
+def fragments_enabled():
+    return getattr(settings, 'BLOG_FRAGMENTS_ENABLED', False)
+
+
+def make_marker(name, **kwargs):
+    """Метка, вместо которой middleware подставит фрагмент name."""
+    params = ''
+    for key, value in sorted(kwargs.items()):
+        value = str(value)
+        if not VALUE_RE.fullmatch(value):
+            raise ValueError(
+                f'Недопустимое значение {key}={value!r} для фрагмента {name}.'
+            )
+        params += f' {key}={value}'
+    return MARKER.format(name, params)
+
+
+def parse_params(params):
+    return {
+        key: int(value) if value.isdigit() else value
+        for key, value in (param.split('=') for param in params.split())
+    }
+
+
+def render_fragment(request, name, **kwargs):
+    context = FRAGMENT_CONTEXTS.get(name, dict)()
+    context.update(kwargs)
+    return render_to_string(FRAGMENT_TEMPLATE.format(name), context, request)
+
+
+def resolve_fragments(request, content):
+    """Заменяет метки в content фрагментами для посетителя request."""
+    rendered = {}
+
+    def replace(match):
+        marker = match.group(0)
+        if marker not in rendered:
+            rendered[marker] = render_fragment(
+                request, match.group(1), **parse_params(match.group(2))
+            )
+        return rendered[marker]
+
+    return MARKER_RE.sub(replace, content)
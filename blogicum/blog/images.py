@@ -0,0 +1,107 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from blog.constants import (
+    IMAGE_JPEG_QUALITY,
+    IMAGE_VARIANTS_DIR,
+    IMAGE_WEBP_QUALITY,
+    IMAGE_WIDTHS)
+from blog.storage import image_storage
+
+
+def get_variant_widths(width):
+    """Ширины вариантов: не больше исходной, исходная — если она меньше."""
+    widths = [value for value in IMAGE_WIDTHS if value < width]
+    if len(widths) < len(IMAGE_WIDTHS):
+        widths.append(width)
+    return widths
+
+
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+
+def save_variant(image, source_name, width, image_format, **params):
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **params)
+    stem = PurePosixPath(source_name).stem
+    name = image_storage.save(
+        f'{IMAGE_VARIANTS_DIR}/{stem}_{width}.{EXTENSIONS[image_format]}',
+        ContentFile(buffer.getvalue())
+    )
+    return {'name': name, 'width': image.width, 'height': image.height}
+
+
+def build_image_variants(name):
+    """Уменьшенные копии изображения name в исходном формате и в WebP.
+
+    Возвращает данные для Post.image_variants. Если файл не удалось
+    прочитать как изображение, в них будет только имя исходного файла.
+    """
+    try:
+        with image_storage.open(name) as image_file, \
+                Image.open(image_file) as source:
+            image = ImageOps.exif_transpose(source)
+            image.load()
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        return {'source': name}
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (
+        image.mode == 'P' and 'transparency' in image.info
+    )
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    fallback_format = 'PNG' if has_alpha else 'JPEG'
+    variants = {'fallback': [], 'webp': []}
+    for width in get_variant_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        variants['fallback'].append(save_variant(
+            resized, name, width, fallback_format,
+            quality=IMAGE_JPEG_QUALITY, optimize=True
+        ))
+        variants['webp'].append(save_variant(
+            resized, name, width, 'WEBP',
+            quality=IMAGE_WEBP_QUALITY
+        ))
+    return {
+        'source': name,
+        'width': image.width,
+        'height': image.height,
+        **variants,
+    }
+
+
+class ResponsiveImage:
+    """Атрибуты <img> и <source> по данным Post.image_variants."""
+
+    __slots__ = ('width', 'height', 'src', 'srcset', 'webp_srcset')
+
+    def __init__(self, variants):
+        # Размеры берутся у копии из src, чтобы место под фото совпало
+        # с загруженной картинкой.
+        largest = variants['fallback'][-1]
+        self.width = largest['width']
+        self.height = largest['height']
+        self.src = image_storage.url(largest['name'])
+        self.srcset = self.get_srcset(variants['fallback'])
+        self.webp_srcset = self.get_srcset(variants['webp'])
+
+    @staticmethod
+    def get_srcset(variants):
+        return ', '.join(
+            f'{image_storage.url(variant["name"])} {variant["width"]}w'
+            for variant in variants
+        )
+
+    @classmethod
+    def from_variants(cls, name, variants):
+        """Копии для файла name, если они уже готовы."""
+        if variants.get('source') != name or not variants.get('fallback'):
+            return None
+        return cls(variants)
+
+
+def is_image_pending(name, variants):
+    """Фото загружено, но его копии ещё не обработаны."""
+    return bool(name) and variants.get('source') != name
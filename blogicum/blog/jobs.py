@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from blog.constants import IMAGE_JOB_ATTEMPTS, IMAGE_JOB_TIMEOUT
+from blog.models import ImageJob, Post
+
+
+def stale_jobs_filter():
+    """Задачи, которые обработчик взял и не завершил за IMAGE_JOB_TIMEOUT.
+
+    Так бывает, если процесс обработчика упал или был остановлен.
+    """
+    return Q(
+        status=ImageJob.Status.PROCESSING,
+        claimed_at__lt=timezone.now() - timedelta(seconds=IMAGE_JOB_TIMEOUT)
+    )
+
+
+def claim_jobs(limit):
+    """Забирает из очереди до limit задач.
+
+    Задача достаётся тому обработчику, чей UPDATE перевёл её
+    в обработку, поэтому обработчиков может быть несколько. Зависшие
+    задачи забираются снова, пока не исчерпаны попытки.
+    """
+    stale = stale_jobs_filter()
+    for job in ImageJob.objects.filter(
+            stale, attempts__gte=IMAGE_JOB_ATTEMPTS):
+        fail_job(job, 'Обработчик не завершил задачу вовремя.')
+    claimable = ImageJob.objects.filter(
+        Q(status=ImageJob.Status.PENDING)
+        | stale & Q(attempts__lt=IMAGE_JOB_ATTEMPTS)
+    )
+    claimed = [
+        pk for pk in claimable.values_list('pk', flat=True)[:limit]
+        if claimable.filter(pk=pk).update(
+            status=ImageJob.Status.PROCESSING,
+            attempts=F('attempts') + 1,
+            claimed_at=timezone.now()
+        )
+    ]
+    return list(ImageJob.objects.filter(pk__in=claimed))
+
+
+def save_variants(post_id, source, variants):
+    """Сохраняет копии, если у публикации всё ещё фото source.
+
+    Сохранение через save() учитывает ссылки на файлы копий в MediaBlob.
+    """
+    with transaction.atomic():
+        post = Post.objects.select_for_update().filter(
+            pk=post_id, image=source
+        ).first()
+        if post is not None:
+            post.image_variants = variants
+            post.save(update_fields=('image_variants', 'updated_at'))
+
+
+def complete_job(job, variants):
+    save_variants(job.post_id, job.source, variants)
+    job.status = ImageJob.Status.DONE
+    job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=('status', 'error', 'finished_at'))
+
+
+def fail_job(job, error):
+    """Возвращает задачу в очередь, пока не исчерпаны попытки.
+
+    После последней попытки публикация показывает исходное фото.
+    """
+    job.error = error
+    if job.attempts < IMAGE_JOB_ATTEMPTS:
+        job.status = ImageJob.Status.PENDING
+    else:
+        job.status = ImageJob.Status.FAILED
+        job.finished_at = timezone.now()
+        save_variants(job.post_id, job.source, {'source': job.source})
+    job.save(update_fields=('status', 'error', 'finished_at'))
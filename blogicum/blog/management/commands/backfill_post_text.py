@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.cache import bump_generation
+from blog.models import Post
+from blog.utils import render_excerpt, render_text_html
+
+
+class Command(BaseCommand):
+    help = 'Заново формирует начало текста и HTML-текст публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        updated = 0
+        while True:
+            posts = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk').only(
+                    'text', 'excerpt', 'text_html')[:batch_size]
+            )
+            if not posts:
+                break
+            last_pk = posts[-1].pk
+            changed = []
+            now = timezone.now()
+            for post in posts:
+                excerpt = render_excerpt(post.text)
+                text_html = render_text_html(post.text)
+                if (post.excerpt, post.text_html) != (excerpt, text_html):
+                    post.excerpt = excerpt
+                    post.text_html = text_html
+                    # Новое время изменения сбрасывает кеш карточки.
+                    post.updated_at = now
+                    changed.append(post)
+            Post.objects.bulk_update(
+                changed, ('excerpt', 'text_html', 'updated_at')
+            )
+            updated += len(changed)
+        if updated:
+            # bulk_update не отправляет сигналы, сбрасывающие кеш страниц.
+            bump_generation('posts')
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено публикаций: {updated}'
+        ))
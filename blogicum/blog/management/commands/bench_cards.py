@@ -0,0 +1,61 @@
+import tracemalloc
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.test import override_settings
+
+from blog.bench import DUMMY_CACHES
+from blog.models import Post
+
+CARDS_TEMPLATE = (
+    '{% for post in posts %}{% include "includes/post_card.html" %}'
+    '{% endfor %}'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время и память на выборку и отрисовку карточек '
+        'из экземпляров моделей и из объектов PostCard.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--cards', type=int, default=1000)
+
+    def get_querysets(self, number):
+        queryset = Post.objects.with_card_data()[:number]
+        return {
+            'модели': queryset,
+            'PostCard': Post.objects.with_card_data().as_cards()[:number],
+        }
+
+    def measure(self, template, queryset, repeat):
+        started = perf_counter()
+        for _ in range(repeat):
+            template.render({'posts': list(queryset.all())})
+        elapsed = (perf_counter() - started) / repeat * 1000
+        tracemalloc.start()
+        posts = list(queryset.all())
+        fetched, _ = tracemalloc.get_traced_memory()
+        template.render({'posts': posts})
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return len(posts), elapsed, fetched, peak
+
+    def handle(self, *args, **options):
+        if not Post.objects.exists():
+            raise CommandError('В базе нет публикаций для замера.')
+        template = engines['django'].from_string(CARDS_TEMPLATE)
+        with override_settings(CACHES=DUMMY_CACHES):
+            for name, queryset in self.get_querysets(
+                    options['cards']).items():
+                number, elapsed, fetched, peak = self.measure(
+                    template, queryset, options['repeat']
+                )
+                self.stdout.write(
+                    f'{name}: {number} карточек, {elapsed:.2f} мс, '
+                    f'память выборки {fetched / 1024:.0f} КиБ, '
+                    f'пик с отрисовкой {peak / 1024:.0f} КиБ'
+                )
@@ -0,0 +1,46 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.constants import PAGINATION
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время и число запросов для выборок ленты постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=100)
+        parser.add_argument('--page-size', type=int, default=PAGINATION)
+
+    def get_querysets(self):
+        post = Post.objects.order_by('pk').first()
+        querysets = {
+            'index': Post.objects.published().with_card_data(),
+        }
+        if post is not None:
+            querysets['category'] = Post.objects.filter(
+                category_id=post.category_id
+            ).published().with_card_data()
+            querysets['profile'] = Post.objects.filter(
+                author_id=post.author_id
+            ).published().with_card_data()
+        return querysets
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        page_size = options['page_size']
+        for name, queryset in self.get_querysets().items():
+            with CaptureQueriesContext(connection) as queries:
+                list(queryset[:page_size])
+            started = perf_counter()
+            for _ in range(repeat):
+                list(queryset[:page_size])
+            elapsed = (perf_counter() - started) / repeat * 1000
+            self.stdout.write(
+                f'{name}: {elapsed:.3f} мс на страницу, '
+                f'запросов: {len(queries)}'
+            )
+            self.stdout.write(f'  {queries.captured_queries[0]["sql"]}')
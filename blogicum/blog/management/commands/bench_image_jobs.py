@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from PIL import Image
+
+from blog.images import build_image_variants
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет, сколько фото в секунду обрабатывает пул процессов '
+        'process_image_jobs при разном числе процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=32)
+        parser.add_argument(
+            '--size', type=int, nargs=2, default=[4000, 3000],
+            metavar=('WIDTH', 'HEIGHT')
+        )
+        parser.add_argument(
+            '--workers', type=int, nargs='+',
+            default=sorted({1, os.cpu_count()})
+        )
+
+    def make_sources(self, number, size):
+        buffer = BytesIO()
+        Image.effect_noise(size, 64).convert('RGB').save(
+            buffer, format='JPEG', quality=90
+        )
+        return [
+            default_storage.save(
+                f'bench/source_{index}.jpg', ContentFile(buffer.getvalue())
+            )
+            for index in range(number)
+        ]
+
+    def handle(self, *args, **options):
+        # Пул наследует MEDIA_ROOT при запуске процессов через fork.
+        with TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root):
+            names = self.make_sources(options['jobs'], options['size'])
+            for workers in options['workers']:
+                with ProcessPoolExecutor(workers) as executor:
+                    started = perf_counter()
+                    list(executor.map(build_image_variants, names))
+                    elapsed = perf_counter() - started
+                rate = len(names) / elapsed
+                self.stdout.write(
+                    f'{workers} процесс(ов): {rate:.1f} фото/с, '
+                    f'{rate / workers:.1f} фото/с на процесс'
+                )
@@ -0,0 +1,48 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.loader import get_template
+
+from blog.constants import PAGE_RANGE_ON_EACH_SIDE, PAGE_RANGE_ON_ENDS
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет время отрисовки includes/paginator.html '
+        'в зависимости от числа страниц.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument(
+            '--pages', type=int, nargs='+', default=[10, 1000, 100000]
+        )
+
+    def render(self, template, paginator, number):
+        page = paginator.page(number)
+        page.next_cursor = 'cursor'
+        return template.render({
+            'page_obj': page,
+            'page_range': paginator.get_elided_page_range(
+                number,
+                on_each_side=PAGE_RANGE_ON_EACH_SIDE,
+                on_ends=PAGE_RANGE_ON_ENDS
+            ),
+        })
+
+    def handle(self, *args, **options):
+        template = get_template('includes/paginator.html')
+        repeat = options['repeat']
+        for num_pages in options['pages']:
+            paginator = Paginator(range(num_pages), 1)
+            number = num_pages // 2 or 1
+            html = self.render(template, paginator, number)
+            started = perf_counter()
+            for _ in range(repeat):
+                self.render(template, paginator, number)
+            elapsed = (perf_counter() - started) / repeat * 1000
+            self.stdout.write(
+                f'{num_pages} страниц: {elapsed:.3f} мс, '
+                f'{len(html)} байт HTML'
+            )
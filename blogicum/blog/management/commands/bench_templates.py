@@ -0,0 +1,96 @@
+from time import perf_counter
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.template import engines
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from blog.bench import DUMMY_CACHES
+from blog.models import Category, Location, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время отрисовки ленты шаблонами Django и Jinja2 '
+        'для разного числа карточек.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--cards', type=int, nargs='+', default=[10, 100, 1000]
+        )
+        parser.add_argument(
+            '--fragment-cache',
+            action='store_true',
+            help='Не отключать кеш карточек в шаблонах Django.'
+        )
+
+    def make_posts(self, number):
+        author = User(pk=1, username='author')
+        category = Category(
+            pk=1, title='Категория', slug='category', is_published=True
+        )
+        location = Location(pk=1, name='Место', is_published=True)
+        now = timezone.now()
+        return [
+            Post(
+                pk=pk,
+                title=f'Публикация {pk}',
+                excerpt='Начало текста публикации из десяти слов …',
+                pub_date=now,
+                updated_at=now,
+                is_published=True,
+                comment_count=pk % 7,
+                author=author,
+                category=category,
+                location=location,
+            )
+            for pk in range(1, number + 1)
+        ]
+
+    def get_context(self, posts):
+        paginator = Paginator(posts, len(posts))
+        page = paginator.page(1)
+        page.next_cursor = None
+        return {
+            'page_obj': page,
+            'page_range': paginator.get_elided_page_range(1),
+        }
+
+    def measure(self, template, posts, request, repeat):
+        template.render(self.get_context(posts), request)
+        started = perf_counter()
+        for _ in range(repeat):
+            template.render(self.get_context(posts), request)
+        return (perf_counter() - started) / repeat * 1000
+
+    def handle(self, *args, **options):
+        available = {engine.name for engine in engines.all()}
+        if 'jinja2' not in available:
+            raise CommandError(
+                'Движок jinja2 не настроен: установите пакет Jinja2.'
+            )
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        caches = {} if options['fragment_cache'] else {'CACHES': DUMMY_CACHES}
+        with override_settings(**caches):
+            for number in options['cards']:
+                posts = self.make_posts(number)
+                timings = {
+                    name: self.measure(
+                        engines[name].get_template('blog/index.html'),
+                        posts,
+                        request,
+                        options['repeat']
+                    )
+                    for name in ('django', 'jinja2')
+                }
+                self.stdout.write(
+                    f'{number} карточек: '
+                    f'django {timings["django"]:.2f} мс, '
+                    f'jinja2 {timings["jinja2"]:.2f} мс, '
+                    f'ускорение x{timings["django"] / timings["jinja2"]:.1f}'
+                )
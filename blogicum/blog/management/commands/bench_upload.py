@@ -0,0 +1,86 @@
+import tracemalloc
+from io import BytesIO
+from time import perf_counter
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler)
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from PIL import Image
+
+from blog.uploads import (
+    ImageUploadField,
+    LimitedUploadHandler,
+    get_request_files)
+
+MODES = {
+    'django': (
+        (MemoryFileUploadHandler, TemporaryFileUploadHandler),
+        forms.ImageField,
+    ),
+    'blog': ((LimitedUploadHandler,), ImageUploadField),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет пик памяти Python и время разбора загрузки большого '
+        'фото и проверки поля формы: обработчики Django и блога.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=int, default=50)
+        parser.add_argument(
+            '--max-size-mb', type=int,
+            help='Предел LimitedUploadHandler на время замера.'
+        )
+
+    def make_body(self, size):
+        buffer = BytesIO()
+        Image.effect_noise((2000, 1500), 64).convert('RGB').save(
+            buffer, format='JPEG'
+        )
+        # Данные после конца JPEG читатели изображений пропускают.
+        content = buffer.getvalue().ljust(size, b'\0')
+        return encode_multipart(
+            BOUNDARY, {'image': SimpleUploadedFile('photo.jpg', content)}
+        )
+
+    def measure(self, body, handlers, field_class):
+        request = RequestFactory().generic(
+            'POST', '/', body, content_type=MULTIPART_CONTENT
+        )
+        request.upload_handlers = [handler(request) for handler in handlers]
+        tracemalloc.start()
+        started = perf_counter()
+        try:
+            field_class().clean(get_request_files(request)['image'])
+            result = 'принят'
+        except ValidationError as error:
+            result = ' '.join(error.messages)
+        elapsed = perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return elapsed, peak, result
+
+    def handle(self, *args, **options):
+        body = self.make_body(options['size_mb'] * 2 ** 20)
+        max_size = LimitedUploadHandler.max_size
+        if options['max_size_mb']:
+            LimitedUploadHandler.max_size = options['max_size_mb'] * 2 ** 20
+        try:
+            for mode, (handlers, field_class) in MODES.items():
+                elapsed, peak, result = self.measure(
+                    body, handlers, field_class
+                )
+                self.stdout.write(
+                    f'{mode:>6}: {elapsed * 1000:7.1f} мс, пик памяти '
+                    f'{peak / 2 ** 20:6.2f} МБ — {result}'
+                )
+        finally:
+            LimitedUploadHandler.max_size = max_size
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import build_image_variants
+from blog.jobs import save_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии и WebP-версии фото публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии и для уже обработанных фото.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        updated = 0
+        while True:
+            posts = list(
+                Post.objects.filter(pk__gt=last_pk).exclude(image='').order_by(
+                    'pk').values_list('pk', 'image', 'image_variants')[
+                    :batch_size]
+            )
+            if not posts:
+                break
+            last_pk = posts[-1][0]
+            for pk, image, variants in posts:
+                if options['force'] or image != variants.get('source'):
+                    save_variants(pk, image, build_image_variants(image))
+                    updated += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано фото: {updated}'
+        ))
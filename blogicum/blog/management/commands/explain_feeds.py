@@ -0,0 +1,64 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+
+from blog.models import Post
+from blog.views import CategoryListView, IndexListView, UserListView
+
+TEMP_SORT = 'USE TEMP B-TREE'
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит EXPLAIN QUERY PLAN для выборок каждой ленты '
+        'и проверяет, что сортировка идёт по индексу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Завершиться с ошибкой, если найдена временная сортировка.'
+        )
+
+    def get_feeds(self):
+        post = Post.objects.select_related('author', 'category').first()
+        if post is None:
+            raise CommandError('В базе нет ни одной публикации.')
+        return (
+            ('index', IndexListView, {}),
+            ('category', CategoryListView,
+             {'category_slug': post.category.slug}),
+            ('profile', UserListView, {'username': post.author.username}),
+        )
+
+    def get_queryset(self, view_class, kwargs):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        view = view_class()
+        view.setup(request, **kwargs)
+        return view.get_queryset()
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда поддерживает только SQLite.')
+        sorted_feeds = []
+        for name, view_class, kwargs in self.get_feeds():
+            plan = self.get_queryset(view_class, kwargs).explain()
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            if TEMP_SORT in plan:
+                sorted_feeds.append(name)
+        if sorted_feeds and options['strict']:
+            raise CommandError(
+                'Временная сортировка в лентах: ' + ', '.join(sorted_feeds)
+            )
+        if sorted_feeds:
+            self.stdout.write(self.style.WARNING(
+                'Временная сортировка в лентах: ' + ', '.join(sorted_feeds)
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                'Все ленты сортируются по индексу.'
+            ))
@@ -0,0 +1,85 @@
+import os
+from itertools import islice
+from pathlib import PurePath
+from time import time
+
+from django.core.management.base import BaseCommand
+
+from blog.models import MediaBlob, Post
+from blog.storage import image_storage
+
+
+def iter_files(path):
+    """Файлы каталога path и вложенных каталогов по одному."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def iter_batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет файлы фото, на которые не ссылается ни одна публикация. '
+        'Обходит хранилище пачками, не собирая все пути в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--min-age', type=int, default=3600,
+            help='Не трогать файлы моложе стольких секунд.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, что будет удалено.'
+        )
+
+    def collect(self, entries, cutoff, dry_run):
+        names = {
+            PurePath(entry.path).relative_to(image_storage.location)
+            .as_posix(): entry for entry in entries
+        }
+        referenced = set(MediaBlob.objects.filter(
+            name__in=names, ref_count__gt=0
+        ).values_list('name', flat=True))
+        garbage = [
+            (name, entry) for name, entry in names.items()
+            if name not in referenced and entry.stat().st_mtime < cutoff
+        ]
+        freed = 0
+        for name, entry in garbage:
+            freed += entry.stat().st_size
+            if dry_run:
+                self.stdout.write(name)
+            else:
+                os.remove(entry.path)
+        if not dry_run:
+            MediaBlob.objects.filter(
+                name__in=[name for name, _ in garbage], ref_count=0
+            ).delete()
+        return len(garbage), freed
+
+    def handle(self, *args, **options):
+        root = image_storage.path(Post._meta.get_field('image').upload_to)
+        if not os.path.isdir(root):
+            return
+        cutoff = time() - options['min_age']
+        scanned = deleted = freed = 0
+        for batch in iter_batches(iter_files(root), options['batch_size']):
+            count, size = self.collect(batch, cutoff, options['dry_run'])
+            scanned += len(batch)
+            deleted += count
+            freed += size
+        verb = 'Будет удалено' if options['dry_run'] else 'Удалено'
+        self.stdout.write(
+            f'Проверено файлов: {scanned}. {verb}: {deleted}, '
+            f'{freed / 2 ** 20:.1f} МБ'
+        )
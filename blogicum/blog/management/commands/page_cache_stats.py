@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import get_metrics, reset_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает счётчики кеша страниц: попадания, промахи, '
+        'устаревшие копии и пересборки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true', help='Обнулить счётчики.'
+        )
+
+    def handle(self, *args, **options):
+        metrics = get_metrics()
+        for name, value in metrics.items():
+            self.stdout.write(f'{name}: {value}')
+        total = sum(metrics.values())
+        if total:
+            served = metrics['hit'] + metrics['stale']
+            self.stdout.write(f'из кеша: {served / total:.1%}')
+        if options['reset']:
+            reset_metrics()
+            self.stdout.write('Счётчики обнулены.')
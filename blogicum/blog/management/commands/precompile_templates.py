@@ -0,0 +1,21 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+
+from blog.utils import precompile_templates
+
+
+class Command(BaseCommand):
+    help = 'Разбирает все шаблоны проекта и падает при первой ошибке.'
+
+    def handle(self, *args, **options):
+        started = perf_counter()
+        try:
+            names = precompile_templates()
+        except (TemplateSyntaxError, TemplateDoesNotExist) as error:
+            raise CommandError(f'Ошибка в шаблоне: {error}')
+        elapsed = (perf_counter() - started) * 1000
+        self.stdout.write(self.style.SUCCESS(
+            f'Разобрано шаблонов: {len(names)} за {elapsed:.1f} мс'
+        ))
@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed)
+from time import sleep
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.images import build_image_variants
+from blog.jobs import claim_jobs, complete_job, fail_job
+
+
+class Command(BaseCommand):
+    help = (
+        'Обрабатывает очередь фото публикаций: создаёт уменьшенные '
+        'копии и WebP-версии в пуле процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Число процессов; 1 — обработка в текущем процессе.'
+        )
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать очередь и завершиться.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=2.0,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+
+    def get_executor(self, workers):
+        if workers > 1:
+            # Дочерние процессы не работают с базой данных.
+            connections.close_all()
+            return ProcessPoolExecutor(workers)
+        return ThreadPoolExecutor(1)
+
+    def process(self, executor, jobs):
+        futures = {
+            executor.submit(build_image_variants, job.source): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                variants = future.result()
+            except Exception as error:
+                fail_job(job, repr(error))
+                self.stderr.write(f'{job.source}: {error!r}')
+            else:
+                complete_job(job, variants)
+
+    def handle(self, *args, **options):
+        processed = 0
+        with self.get_executor(options['workers']) as executor:
+            while True:
+                jobs = claim_jobs(options['batch_size'])
+                if jobs:
+                    self.process(executor, jobs)
+                    processed += len(jobs)
+                elif options['once']:
+                    break
+                else:
+                    sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано задач: {processed}'
+        ))
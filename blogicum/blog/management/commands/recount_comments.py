@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённое число комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        fixed = 0
+        while True:
+            pks = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                    'pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            last_pk = pks[-1]
+            with transaction.atomic():
+                drifted = list(
+                    Post.objects.filter(pk__in=pks)
+                    .annotate(actual=Count('comments'))
+                    .exclude(comment_count=F('actual'))
+                    .only('pk')
+                )
+                for post in drifted:
+                    post.comment_count = post.actual
+                Post.objects.bulk_update(drifted, ('comment_count',))
+            fixed += len(drifted)
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено публикаций: {fixed}'
+        ))
@@ -0,0 +1,137 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max
+from django.test import Client
+from django.urls import reverse
+
+from blog.cache import page_cache_enabled
+from blog.constants import PAGINATION
+from blog.models import Category, Post
+from blog.paginators import encode_cursor
+
+CursorKey = namedtuple('CursorKey', ('pub_date', 'pk'))
+
+
+def get_page_urls(url, count, max_pages):
+    """Адреса первых страниц ленты из count записей."""
+    pages = min(max_pages, ceil(count / PAGINATION)) or 1
+    return [url] + [f'{url}?page={number}' for number in range(2, pages + 1)]
+
+
+def get_cursor_urls(url, queryset, max_pages):
+    """Адреса ?after= страниц 2..max_pages.
+
+    По ним ведут ссылки «дальше», поэтому курсоры считаются так же,
+    как в ленте: по последней записи каждой страницы.
+    """
+    keys = list(queryset.order_by('-pub_date', '-pk').values_list(
+        'pub_date', 'pk'
+    )[:(max_pages - 1) * PAGINATION + 1])
+    return [
+        f'{url}?after={encode_cursor(CursorKey(*keys[end - 1]))}'
+        for end in range(PAGINATION, len(keys), PAGINATION)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет кеш страниц: запрашивает ленты и категории (адреса '
+        '?page= и ?after=), свежие публикации и профили активных авторов '
+        'через настоящие view.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, default=3,
+            help='Сколько страниц главной ленты запросить.'
+        )
+        parser.add_argument(
+            '--category-pages', type=int, default=1,
+            help='Сколько страниц каждой категории запросить.'
+        )
+        parser.add_argument(
+            '--posts', type=int, default=50,
+            help='Сколько последних публикаций открыть.'
+        )
+        parser.add_argument(
+            '--authors', type=int, default=20,
+            help='Сколько профилей недавно писавших авторов открыть.'
+        )
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument(
+            '--host',
+            default=next(
+                (host for host in settings.ALLOWED_HOSTS
+                 if not host.startswith(('*', '.'))),
+                'localhost'
+            ),
+            help='Значение заголовка Host для запросов.'
+        )
+
+    def get_urls(self, options):
+        published = Post.objects.published()
+        index_url = reverse('blog:index')
+        urls = get_page_urls(index_url, published.count(), options['pages'])
+        urls += get_cursor_urls(index_url, published, options['pages'])
+        counts = dict(
+            published.values_list('category__slug').annotate(Count('pk'))
+        )
+        for slug in Category.objects.filter(
+                is_published=True).values_list('slug', flat=True):
+            category_url = reverse('blog:category_posts', args=(slug,))
+            urls += get_page_urls(
+                category_url, counts.get(slug, 0), options['category_pages']
+            )
+            urls += get_cursor_urls(
+                category_url,
+                published.filter(category__slug=slug),
+                options['category_pages']
+            )
+        urls += [
+            reverse('blog:post_detail', args=(pk,))
+            for pk in published.order_by('-pub_date').values_list(
+                'pk', flat=True)[:options['posts']]
+        ]
+        urls += [
+            reverse('blog:profile', args=(username,))
+            for username in published.values_list(
+                'author__username', flat=True
+            ).annotate(
+                last_pub_date=Max('pub_date')
+            ).order_by('-last_pub_date')[:options['authors']]
+        ]
+        return urls
+
+    def warm(self, url, host):
+        started = perf_counter()
+        response = Client(HTTP_HOST=host).get(url)
+        return url, response.status_code, (perf_counter() - started) * 1000
+
+    def report(self, results):
+        for url, status, elapsed in results:
+            style = self.style.SUCCESS if status == 200 else self.style.ERROR
+            self.stdout.write(style(f'{status} {elapsed:8.1f} мс {url}'))
+
+    def handle(self, *args, **options):
+        if not page_cache_enabled():
+            self.stderr.write(
+                'Кеш страниц выключен (BLOG_PAGE_CACHE_ENABLED): страницы '
+                'будут только отрисованы.'
+            )
+        urls = self.get_urls(options)
+        hosts = [options['host']] * len(urls)
+        started = perf_counter()
+        if options['workers'] > 1:
+            with ThreadPoolExecutor(options['workers']) as executor:
+                self.report(executor.map(self.warm, urls, hosts))
+        else:
+            self.report(map(self.warm, urls, hosts))
+        self.stdout.write(
+            f'Страниц: {len(urls)}, '
+            f'всего {(perf_counter() - started) * 1000:.0f} мс'
+        )
@@ -0,0 +1,156 @@
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import (
+    ImproperlyConfigured,
+    SuspiciousFileOperation)
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from blog.constants import (
+    MEDIA_CHUNK_SIZE,
+    MEDIA_IMMUTABLE_MAX_AGE,
+    MEDIA_MAX_AGE)
+from blog.storage import is_hashed_name
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """Первый и последний байт из заголовка Range.
+
+    None — заголовок не разобран или задаёт несколько диапазонов,
+    тогда отдаётся весь файл.
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        if not int(last):
+            raise RangeNotSatisfiable
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def iter_range(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(MEDIA_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def get_etag(path, file_stat):
+    if is_hashed_name(path):
+        return f'"{os.path.splitext(os.path.basename(path))[0]}"'
+    return f'"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"'
+
+
+def offload_response(path, full_path):
+    """Пустой ответ, файл по которому отдаст сам веб-сервер."""
+    offload = settings.BLOG_MEDIA_OFFLOAD
+    response = HttpResponse()
+    if offload == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = quote(
+            settings.BLOG_MEDIA_ACCEL_PREFIX + path
+        )
+    elif offload == 'x-sendfile':
+        response['X-Sendfile'] = full_path
+    else:
+        raise ImproperlyConfigured(
+            'BLOG_MEDIA_OFFLOAD: ожидается None, "x-accel-redirect" '
+            f'или "x-sendfile", получено {offload!r}.'
+        )
+    return response
+
+
+def file_response(request, full_path, file_stat, etag):
+    """Файл целиком или один диапазон байт из заголовка Range."""
+    size = file_stat.st_size
+    header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if header is None or (if_range and if_range != etag):
+        return FileResponse(open(full_path, 'rb'))
+    try:
+        byte_range = parse_range(header, size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range is None:
+        return FileResponse(open(full_path, 'rb'))
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        iter_range(full_path, start, end - start + 1), status=206
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = end - start + 1
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Отдаёт файл из MEDIA_ROOT без DEBUG.
+
+    Файлы с хешем содержимого в имени кешируются навсегда. В режиме
+    BLOG_MEDIA_OFFLOAD байты файла отдаёт веб-сервер, а не Python.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        file_stat = os.stat(full_path)
+    except (SuspiciousFileOperation, ValueError, OSError):
+        raise Http404
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404
+    etag = get_etag(path, file_stat)
+    last_modified = int(file_stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        if settings.BLOG_MEDIA_OFFLOAD:
+            response = offload_response(path, full_path)
+        else:
+            response = file_response(request, full_path, file_stat, etag)
+            response['Accept-Ranges'] = 'bytes'
+        if response.status_code != 416:
+            response['Content-Type'] = (
+                mimetypes.guess_type(full_path)[0]
+                or 'application/octet-stream'
+            )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if is_hashed_name(path):
+        patch_cache_control(
+            response, public=True, max_age=MEDIA_IMMUTABLE_MAX_AGE,
+            immutable=True
+        )
+    else:
+        patch_cache_control(response, public=True, max_age=MEDIA_MAX_AGE)
+    return response
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+
+from blog.fragments import FRAGMENTS_HEADER, resolve_fragments
+
+
+class SessionlessAnonymousMiddleware:
+    """Не читает сессию посетителя, у которого нет её cookie.
+
+    Без cookie сессии посетитель заведомо анонимный. Если не обращаться
+    к сессии, SessionMiddleware не добавит к ответу Vary: Cookie.
+    Ставится сразу после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            request.user = AnonymousUser()
+        return self.get_response(request)
+
+
+class FragmentMiddleware:
+    """Подставляет персональные фрагменты в страницу из общего кеша.
+
+    Обрабатывает только ответы с заголовком X-Blog-Fragments. Ставится
+    после CsrfViewMiddleware, чтобы токен из формы комментария попал
+    в cookie.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header(FRAGMENTS_HEADER):
+            del response[FRAGMENTS_HEADER]
+            response.content = resolve_fragments(
+                request, response.content.decode(response.charset)
+            )
+            if response.has_header('Content-Length'):
+                response['Content-Length'] = len(response.content)
+        return response
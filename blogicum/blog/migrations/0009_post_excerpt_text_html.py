@@ -0,0 +1,50 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:24
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+# Копии blog.utils на момент миграции: её результат не должен зависеть
+# от последующих изменений кода приложения.
+EXCERPT_WORDS = 10
+EXCERPT_MAX_LENGTH = 256
+
+
+def render_excerpt(text):
+    excerpt = Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+    return Truncator(excerpt).chars(EXCERPT_MAX_LENGTH)
+
+
+def render_text_html(text):
+    return linebreaksbr(text, autoescape=True)
+
+
+def fill_rendered_text(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = []
+    for post in Post.objects.only('text').iterator():
+        post.excerpt = render_excerpt(post.text)
+        post.text_html = render_text_html(post.text)
+        posts.append(post)
+    Post.objects.bulk_update(posts, ('excerpt', 'text_html'), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=256, verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.RunPython(fill_rendered_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:44
+
+from collections import Counter
+
+import blog.storage
+from django.db import migrations, models
+
+
+def count_references(apps, schema_editor):
+    """Файлы, загруженные до подсчёта ссылок, не должен удалить gc_media."""
+    Post = apps.get_model('blog', 'Post')
+    MediaBlob = apps.get_model('blog', 'MediaBlob')
+    counts = Counter()
+    for image, variants in Post.objects.values_list(
+            'image', 'image_variants').iterator():
+        counts.update(get_media_names(image, variants))
+    MediaBlob.objects.bulk_create(
+        [MediaBlob(name=name, ref_count=count)
+         for name, count in counts.items()],
+        batch_size=500
+    )
+
+
+def get_media_names(image, variants):
+    names = {image} if image else set()
+    for key in ('fallback', 'webp'):
+        names.update(variant['name'] for variant in variants.get(key, ()))
+    return names
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_imagejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256, unique=True, verbose_name='Файл')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Ссылок')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'файл фото',
+                'verbose_name_plural': 'Файлы фото',
+                'ordering': ('name',),
+            },
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, storage=blog.storage.HashedFileSystemStorage(), upload_to='blogicum_images', verbose_name='Фото'),
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def enqueue_existing_images(apps, schema_editor):
+    """Фото, загруженные до очереди, иначе навсегда остались бы заглушкой."""
+    Post = apps.get_model('blog', 'Post')
+    ImageJob = apps.get_model('blog', 'ImageJob')
+    jobs = [
+        ImageJob(post_id=pk, source=image)
+        for pk, image, variants in Post.objects.exclude(image='').values_list(
+            'pk', 'image', 'image_variants'
+        ).iterator()
+        if variants.get('source') != image
+    ]
+    ImageJob.objects.bulk_create(jobs, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_mediablob'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            enqueue_existing_images, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_enqueue_existing_images'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagejob',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Взята в работу'),
+        ),
+    ]
@@ -1,10 +1,317 @@
-from django.shortcuts import redirect
+from hashlib import md5
+
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db.models import Max
+from django.db.models.functions import Greatest
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect
+from django.utils.cache import patch_cache_control
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+from django.views.decorators.http import condition
+
+from blog.cache import (
+    acquire_lock,
+    cache_page,
+    count_metric,
+    discard_page_entry,
+    get_cached_last_modified,
+    get_cached_page,
+    get_generations_changed_at,
+    get_page_key,
+    get_stale_page_key,
+    get_versions,
+    is_fresh,
+    page_cache_enabled,
+    release_lock,
+    stale_while_revalidate_enabled,
+    store_page_entry,
+    strip_validators,
+    wait_for_page)
+from blog.constants import PAGE_RANGE_ON_EACH_SIDE, PAGE_RANGE_ON_ENDS
+from blog.fragments import FRAGMENTS_HEADER, fragments_enabled
+from blog.paginators import CursorPaginator, FeedPaginator, encode_cursor
+from blog.uploads import get_request_files
 
 
 class DispatchMixin:
+    """Пускает к изменению объекта только его автора."""
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object(queryset)
+        return self._object
 
     def dispatch(self, request, *args, **kwargs):
-        post = super().get_object()
-        if post.author != self.request.user:
+        if self.get_object().author_id != request.user.id:
             return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
+
+
+class RelatedObjectMixin:
+    """Находит объект, к которому относится страница, один раз за запрос."""
+
+    related_model = None
+    related_field = None
+    related_url_kwarg = None
+
+    def get_related_queryset(self):
+        return self.related_model._default_manager.all()
+
+    @cached_property
+    def related_object(self):
+        return get_object_or_404(
+            self.get_related_queryset(),
+            **{self.related_field: self.kwargs[self.related_url_kwarg]}
+        )
+
+
+class CursorPaginationMixin:
+    """Ведёт ленту по курсору ?after=, сохраняя ссылки вида ?page=."""
+
+    cursor_kwarg = 'after'
+
+    def get_count_key(self):
+        """Ключ, под которым кешируется число записей ленты."""
+        return None
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        count_strategy = import_string(getattr(
+            settings,
+            'BLOG_FEED_COUNT_STRATEGY',
+            'blog.paginators.ExactCount'
+        ))()
+        return FeedPaginator(
+            queryset,
+            per_page,
+            count_strategy=count_strategy,
+            count_key=self.get_count_key(),
+            **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if getattr(settings, 'BLOG_FEED_POST_CARDS', False):
+            queryset = queryset.as_cards()
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if cursor is None:
+            paginator, page, object_list, is_paginated = (
+                super().paginate_queryset(queryset, page_size)
+            )
+            page.next_cursor = (
+                encode_cursor(page[-1]) if page.has_next() else None
+            )
+            return paginator, page, page.object_list, is_paginated
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(cursor)
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None and page.number is not None:
+            context['page_range'] = page.paginator.get_elided_page_range(
+                page.number,
+                on_each_side=PAGE_RANGE_ON_EACH_SIDE,
+                on_ends=PAGE_RANGE_ON_ENDS
+            )
+        return context
+
+
+class PageCacheMixin:
+    """Отдаёт анонимным посетителям страницу из кеша.
+
+    Ключ страницы включает поколения данных из cache_generations,
+    которые увеличиваются сигналами при изменении публикаций: posts —
+    общее для всех страниц, feed:<лента> и post:<id> — свои у каждой
+    ленты и публикации.
+    С BLOG_FRAGMENTS_ENABLED персональные части страницы заменяются
+    метками, и общий кеш обслуживает также авторизованных посетителей.
+    """
+
+    cache_generations = ('posts',)
+
+    def get_cache_generations(self):
+        return self.cache_generations
+
+    def is_page_shared(self):
+        """Страница одна для всех, кроме персональных фрагментов."""
+        return True
+
+    def can_cache_page(self, request):
+        if not page_cache_enabled() or request.method not in ('GET', 'HEAD'):
+            return False
+        if not request.user.is_authenticated:
+            return True
+        return fragments_enabled() and self.is_page_shared()
+
+    def can_store_page(self):
+        """Можно ли отдать только что собранную страницу любому посетителю."""
+        return True
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['defer_fragments'] = fragments_enabled()
+        return context
+
+    def dispatch(self, request, *args, **kwargs):
+        response = self.get_page(request, *args, **kwargs)
+        if fragments_enabled():
+            response[FRAGMENTS_HEADER] = '1'
+        return response
+
+    def get_page(self, request, *args, **kwargs):
+        if not self.can_cache_page(request):
+            return super().dispatch(request, *args, **kwargs)
+        if stale_while_revalidate_enabled():
+            return self.get_page_or_stale(request, *args, **kwargs)
+        key = get_page_key(request, self.get_cache_generations())
+        response = get_cached_page(key)
+        if response is not None:
+            count_metric('hit')
+            strip_validators(response)
+            return response
+        count_metric('miss')
+        response = super().dispatch(request, *args, **kwargs)
+        if self.can_store_page():
+            cache_page(key, response)
+        return response
+
+    def get_page_or_stale(self, request, *args, **kwargs):
+        """Отдаёт устаревшую копию, пока страницу пересобирает один запрос.
+
+        Если копии ещё нет, остальные запросы недолго ждут страницу
+        от владельца блокировки, а не собирают её одновременно.
+        """
+        key = get_stale_page_key(request)
+        versions = get_versions(self.get_cache_generations())
+        entry = get_cached_page(key)
+        if entry is not None and is_fresh(entry, versions):
+            count_metric('hit')
+            strip_validators(entry.response)
+            return entry.response
+        lock_token = acquire_lock(key)
+        if lock_token is None:
+            metric = 'hit' if entry is None else 'stale'
+            entry = entry or wait_for_page(key)
+            if entry is not None:
+                count_metric(metric)
+                strip_validators(entry.response)
+                return entry.response
+        count_metric('miss' if entry is None else 'regeneration')
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        except Http404:
+            discard_page_entry(key, lock_token)
+            raise
+        except Exception:
+            release_lock(key, lock_token)
+            raise
+        if lock_token is not None and self.can_store_page():
+            store_page_entry(key, versions, response, lock_token)
+        else:
+            discard_page_entry(key, lock_token)
+        return response
+
+
+class ConditionalGetMixin(PageCacheMixin):
+    """Отвечает 304, пока данные страницы не менялись.
+
+    Last-Modified считается одним запросом MAX() по выборке из
+    get_last_modified_queryset() с учётом времени смены поколений данных,
+    чтобы удаление записи тоже меняло его. ETag добавляет к нему поколения
+    данных и посетителя. Обе проверки выполняются до основной выборки.
+    Авторизованному посетителю отдаётся только его собственный ETag.
+    """
+
+    def get_last_modified_queryset(self):
+        raise NotImplementedError
+
+    def compute_last_modified(self):
+        last_modified = self.get_last_modified_queryset().aggregate(
+            last_modified=Greatest(Max('updated_at'), Max('pub_date'))
+        )['last_modified']
+        changed_at = get_generations_changed_at(self.get_cache_generations())
+        if last_modified is None or changed_at is None:
+            return last_modified
+        return max(last_modified, changed_at)
+
+    def get_last_modified(self):
+        if not hasattr(self, '_last_modified'):
+            if (not self.request.user.is_authenticated
+                    and self.can_cache_page(self.request)):
+                self._last_modified = get_cached_last_modified(
+                    self.request,
+                    self.get_cache_generations(),
+                    self.compute_last_modified
+                )
+            else:
+                self._last_modified = self.compute_last_modified()
+        return self._last_modified
+
+    def get_etag(self):
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return None
+        raw = (
+            f'{get_versions(self.get_cache_generations())}:'
+            f'{self.request.user.pk}:{last_modified.isoformat()}'
+        )
+        return md5(raw.encode()).hexdigest()
+
+    def get_last_modified_header(self):
+        """Last-Modified не различает посетителей, поэтому только анонимам."""
+        if self.request.user.is_authenticated:
+            return None
+        return self.get_last_modified()
+
+    def dispatch(self, request, *args, **kwargs):
+        return condition(
+            etag_func=lambda *args, **kwargs: self.get_etag(),
+            last_modified_func=lambda *args, **kwargs: (
+                self.get_last_modified_header()
+            )
+        )(super().dispatch)(request, *args, **kwargs)
+
+
+class CacheControlMixin:
+    """Разрешает общим кешам хранить страницу анонимного посетителя.
+
+    Срок хранения задаётся атрибутом cache_max_age. Страницы
+    авторизованных пользователей помечаются как private.
+    """
+
+    cache_max_age = None
+
+    def get_cache_max_age(self):
+        return self.cache_max_age
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        max_age = self.get_cache_max_age()
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True)
+        elif max_age is not None and request.method in ('GET', 'HEAD'):
+            patch_cache_control(response, public=True, max_age=max_age)
+        return response
+
+
+class TemplateEngineMixin:
+    """Рендерит страницу движком из настройки BLOG_TEMPLATE_ENGINE."""
+
+    @property
+    def template_engine(self):
+        return getattr(settings, 'BLOG_TEMPLATE_ENGINE', None)
+
+
+class UploadFormMixin:
+    """Передаёт форме и загрузки, прерванные из-за размера."""
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        if 'files' in kwargs:
+            kwargs['files'] = get_request_files(self.request)
+        return kwargs
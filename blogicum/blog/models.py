@@ -1,6 +1,12 @@
-from blog.constants import TEXT_RESTRICTION
+from blog.cards import PostCard, PostCardIterable
+from blog.constants import EXCERPT_MAX_LENGTH, TEXT_RESTRICTION
+from blog.images import ResponsiveImage, is_image_pending
+from blog.storage import image_storage
+from blog.utils import render_excerpt, render_text_html
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -53,12 +59,66 @@ class Location(CreatedPublishedModel):
         return self.name[:TEXT_RESTRICTION]
 
 
+def get_media_names(image, image_variants):
+    names = {image} if image else set()
+    for key in ('fallback', 'webp'):
+        names.update(
+            variant['name'] for variant in image_variants.get(key, ())
+        )
+    return names
+
+
+class PostQuerySet(models.QuerySet):
+    """Единое место, где описаны правила видимости и выборки постов."""
+
+    @staticmethod
+    def published_filter():
+        # SQLite не использует индекс для условия «is_published» без
+        # сравнения, поэтому флаг поста проверяется через IN.
+        return Q(
+            pub_date__lte=timezone.now(),
+            is_published__in=(True,),
+            category__is_published=True
+        )
+
+    def published(self):
+        return self.filter(self.published_filter())
+
+    def visible_to(self, user):
+        """Опубликованные посты и все посты самого пользователя."""
+        if user.is_authenticated:
+            return self.filter(Q(author=user) | self.published_filter())
+        return self.published()
+
+    def with_card_data(self):
+        return self.select_related(
+            'author', 'location', 'category'
+        ).defer('text', 'text_html').order_by('-pub_date', '-pk')
+
+    def as_cards(self):
+        """Отдаёт посты лёгкими объектами PostCard вместо моделей."""
+        clone = self.values_list(*PostCard.fields)
+        clone._iterable_class = PostCardIterable
+        return clone
+
+
 class Post(CreatedPublishedModel):
     title = models.CharField(
         max_length=256,
         verbose_name='Заголовок'
     )
     text = models.TextField(verbose_name='Текст')
+    excerpt = models.CharField(
+        max_length=EXCERPT_MAX_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Текст в HTML'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=(
@@ -84,17 +144,82 @@ class Post(CreatedPublishedModel):
         null=True,
         verbose_name='Категория'
     )
-    image = models.ImageField('Фото', upload_to='blogicum_images', blank=True)
+    image = models.ImageField(
+        'Фото',
+        upload_to='blogicum_images',
+        storage=image_storage,
+        blank=True
+    )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии фото'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменено')
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(fields=('is_published', 'pub_date'),
+                         name='post_published_pub_date_idx'),
+            models.Index(fields=('category', 'is_published', 'pub_date'),
+                         name='post_category_pub_date_idx'),
+            models.Index(fields=('author', 'pub_date'),
+                         name='post_author_pub_date_idx'),
+        )
 
     def __str__(self):
         return self.title[:TEXT_RESTRICTION]
 
+    @property
+    def is_public(self):
+        """Условие PostQuerySet.published_filter для загруженного поста."""
+        return (
+            self.is_published
+            and self.pub_date <= timezone.now()
+            and self.category is not None
+            and self.category.is_published
+        )
+
+    @property
+    def responsive_image(self):
+        return ResponsiveImage.from_variants(
+            self.image.name, self.image_variants
+        )
+
+    @property
+    def image_pending(self):
+        return is_image_pending(self.image.name, self.image_variants)
+
+    def get_media_names(self):
+        """Файлы хранилища, на которые ссылается публикация."""
+        return get_media_names(self.image.name, self.image_variants)
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None or 'text' in update_fields:
+            self.excerpt = render_excerpt(self.text)
+            self.text_html = render_text_html(self.text)
+            if update_fields is not None:
+                update_fields = {*update_fields, 'excerpt', 'text_html'}
+        # Публикация с новым фото не сохраняется без задачи на его обработку.
+        with transaction.atomic():
+            super().save(*args, update_fields=update_fields, **kwargs)
+            if self.image_pending:
+                ImageJob.objects.get_or_create(
+                    post=self, source=self.image.name
+                )
+
 
 class Comment(models.Model):
     text = models.TextField('Текст комментария')
@@ -114,3 +239,82 @@ class Comment(models.Model):
 
     def __str__(self):
         return f'{self.post, self.author.username[:TEXT_RESTRICTION]}'
+
+
+class ImageJob(models.Model):
+    """Задача на обработку фото публикации вне запроса."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        PROCESSING = 'processing', 'Обрабатывается'
+        DONE = 'done', 'Готово'
+        FAILED = 'failed', 'Ошибка'
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='image_jobs',
+        verbose_name='Публикация'
+    )
+    source = models.CharField('Файл фото', max_length=256)
+    status = models.CharField(
+        'Состояние',
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    error = models.TextField('Ошибка', blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    claimed_at = models.DateTimeField('Взята в работу', null=True, blank=True)
+    finished_at = models.DateTimeField('Завершено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'задача обработки фото'
+        verbose_name_plural = 'Задачи обработки фото'
+        ordering = ('created_at',)
+        indexes = (
+            models.Index(fields=('status', 'created_at'),
+                         name='imagejob_status_created_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.source} ({self.get_status_display()})'
+
+
+class MediaBlobQuerySet(models.QuerySet):
+
+    def add_references(self, names):
+        if not names:
+            return
+        self.bulk_create(
+            [MediaBlob(name=name) for name in names], ignore_conflicts=True
+        )
+        self.filter(name__in=names).update(ref_count=F('ref_count') + 1)
+
+    def remove_references(self, names):
+        if names:
+            self.filter(name__in=names, ref_count__gt=0).update(
+                ref_count=F('ref_count') - 1
+            )
+
+
+class MediaBlob(models.Model):
+    """Файл хранилища фото и число публикаций, которые на него ссылаются.
+
+    Файлы без ссылок удаляет команда gc_media.
+    """
+
+    name = models.CharField('Файл', max_length=256, unique=True)
+    ref_count = models.PositiveIntegerField('Ссылок', default=0)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    objects = MediaBlobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'файл фото'
+        verbose_name_plural = 'Файлы фото'
+        ordering = ('name',)
+
+    def __str__(self):
+        return f'{self.name} ({self.ref_count})'
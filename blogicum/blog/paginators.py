@@ -0,0 +1,127 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+from datetime import datetime
+from functools import partial
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from blog.cache import get_generation
+from blog.constants import FEED_COUNT_CACHE_TIMEOUT
+
+FEED_COUNT_KEY = 'blog:feed-count:{}:{}'
+
+
+def encode_cursor(post):
+    raw = f'{post.pub_date.isoformat()}|{post.pk}'.encode()
+    return urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Дата и id записи из курсора или InvalidPage, если курсор подделан.
+
+    id вне 64-битного диапазона не помещается в параметр запроса SQLite,
+    а дата без часового пояса не сравнивается с датами в базе.
+    """
+    try:
+        raw = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        pub_date, pk = raw.split('|')
+        pub_date, pk = datetime.fromisoformat(pub_date), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidPage('Некорректный курсор страницы.')
+    if timezone.is_naive(pub_date) or not -2 ** 63 <= pk < 2 ** 63:
+        raise InvalidPage('Некорректный курсор страницы.')
+    return pub_date, pk
+
+
+class CursorPage(Sequence):
+    """Страница ленты, следующая за курсором."""
+
+    number = None
+
+    def __init__(self, object_list, next_cursor, paginator):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.paginator = paginator
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return True
+
+    def has_other_pages(self):
+        return True
+
+
+class CursorPaginator:
+    """Постраничный вывод по ключу (pub_date, id) без OFFSET и COUNT(*).
+
+    Выборка должна быть упорядочена по ('-pub_date', '-pk').
+    """
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = per_page
+
+    def page(self, cursor):
+        pub_date, pk = decode_cursor(cursor)
+        posts = list(
+            self.object_list.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )[:self.per_page + 1]
+        )
+        next_cursor = None
+        if len(posts) > self.per_page:
+            posts = posts[:self.per_page]
+            next_cursor = encode_cursor(posts[-1])
+        return CursorPage(posts, next_cursor, self)
+
+
+class ExactCount:
+    """Считает записи ленты запросом COUNT(*) при каждом обращении."""
+
+    def count(self, queryset, key):
+        return queryset.count()
+
+
+class CachedCount(ExactCount):
+    """Хранит результат COUNT(*) в кеше до изменения публикаций.
+
+    Поколение counts меняют только публикации и категории: комментарии,
+    авторы и места на число записей в лентах не влияют.
+    """
+
+    timeout = FEED_COUNT_CACHE_TIMEOUT
+
+    def count(self, queryset, key):
+        if key is None:
+            return super().count(queryset, key)
+        return cache.get_or_set(
+            FEED_COUNT_KEY.format(get_generation('counts'), key),
+            partial(super().count, queryset, key),
+            self.timeout
+        )
+
+
+class FeedPaginator(Paginator):
+    """Paginator, число записей для которого даёт стратегия подсчёта."""
+
+    def __init__(self, *args, count_strategy, count_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_strategy = count_strategy
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        return self.count_strategy.count(self.object_list, self.count_key)
@@ -0,0 +1,146 @@
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog.cache import bump_generation
+from blog.models import (
+    Category,
+    Comment,
+    Location,
+    MediaBlob,
+    Post,
+    User,
+    get_media_names)
+from blog.utils import render_excerpt, render_text_html
+
+MEDIA_FIELDS = {'image', 'image_variants'}
+
+
+def get_feed_generations(posts):
+    """Поколения лент, в которые попадают публикации posts."""
+    generations = {'feed:index'}
+    for slug, username in posts.values_list(
+            'category__slug', 'author__username'):
+        if slug is not None:
+            generations.add(f'feed:category:{slug}')
+        generations.add(f'feed:author:{username}')
+    return generations
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+def remember_feeds(sender, instance, **kwargs):
+    # Публикация могла уйти из ленты прежней категории или автора.
+    instance._saved_feeds = (
+        set() if instance._state.adding
+        else get_feed_generations(Post.objects.filter(pk=instance.pk))
+    )
+
+
+@receiver(post_save, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    bump_generation(
+        'counts', f'post:{instance.pk}',
+        *instance._saved_feeds,
+        *get_feed_generations(Post.objects.filter(pk=instance.pk))
+    )
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    bump_generation('counts', f'post:{instance.pk}', *instance._saved_feeds)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_commented_post(sender, instance, **kwargs):
+    # Число комментариев видно в карточке публикации в лентах.
+    bump_generation(
+        f'post:{instance.post_id}',
+        *get_feed_generations(Post.objects.filter(pk=instance.post_id))
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, **kwargs):
+    bump_generation('posts', 'counts')
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location(sender, **kwargs):
+    bump_generation('posts')
+
+
+@receiver(post_save, sender=User)
+def invalidate_author(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_generation('posts')
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1,
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1,
+        updated_at=timezone.now()
+    )
+
+
+@receiver(pre_save, sender=Post)
+def fill_updated_at(sender, instance, raw, **kwargs):
+    # auto_now не срабатывает при loaddata, а в фикстурах поля может не быть.
+    if raw and instance.updated_at is None:
+        instance.updated_at = timezone.now()
+
+
+@receiver(pre_save, sender=Post)
+def fill_rendered_text(sender, instance, raw, **kwargs):
+    # При loaddata Post.save() не вызывается, а фикстуры хранят только text.
+    if raw and not (instance.excerpt and instance.text_html):
+        instance.excerpt = render_excerpt(instance.text)
+        instance.text_html = render_text_html(instance.text)
+
+
+@receiver(pre_save, sender=Post)
+def remember_media(sender, instance, update_fields=None, **kwargs):
+    instance._saved_media = None
+    if update_fields is not None and not MEDIA_FIELDS & set(update_fields):
+        return
+    if instance._state.adding:
+        instance._saved_media = set()
+        return
+    saved = Post.objects.filter(pk=instance.pk).values_list(
+        'image', 'image_variants'
+    ).first()
+    instance._saved_media = get_media_names(*saved) if saved else set()
+
+
+@receiver(post_save, sender=Post)
+def update_media_references(sender, instance, **kwargs):
+    saved = instance._saved_media
+    if saved is None:
+        return
+    current = instance.get_media_names()
+    MediaBlob.objects.add_references(current - saved)
+    MediaBlob.objects.remove_references(saved - current)
+
+
+@receiver(post_delete, sender=Post)
+def release_media(sender, instance, **kwargs):
+    MediaBlob.objects.remove_references(instance.get_media_names())
@@ -0,0 +1,60 @@
+import os
+import re
+from hashlib import sha256
+from pathlib import PurePosixPath
+from tempfile import NamedTemporaryFile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASHED_NAME_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def is_hashed_name(name):
+    """Имя файла — хеш содержимого, то есть файл никогда не меняется."""
+    return bool(HASHED_NAME_RE.match(PurePosixPath(name).stem))
+
+
+@deconstructible
+class HashedFileSystemStorage(FileSystemStorage):
+    """Хранит файлы под именем из SHA-256 их содержимого.
+
+    Одинаковые загрузки превращаются в один файл
+    <каталог>/<2 символа хеша>/<хеш><расширение>. Файлы не удаляются
+    при смене фото: ссылки на них считает MediaBlob, а свободные файлы
+    удаляет команда gc_media.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def get_hashed_name(self, name, content):
+        digest = sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        hexdigest = digest.hexdigest()
+        path = PurePosixPath(name)
+        return str(
+            path.parent / hexdigest[:2] / f'{hexdigest}{path.suffix.lower()}'
+        )
+
+    def _save(self, name, content):
+        name = self.get_hashed_name(name, content)
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            # Свежая отметка времени защищает файл от gc_media,
+            # пока новая ссылка на него не сохранена в базе.
+            os.utime(full_path)
+            return name
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile(dir=directory, delete=False) as temp_file:
+            for chunk in content.chunks():
+                temp_file.write(chunk)
+        if self.file_permissions_mode is not None:
+            os.chmod(temp_file.name, self.file_permissions_mode)
+        os.replace(temp_file.name, full_path)
+        return name
+
+
+image_storage = HashedFileSystemStorage()
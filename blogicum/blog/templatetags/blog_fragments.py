@@ -0,0 +1,22 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.fragments import FRAGMENT_TEMPLATE, make_marker
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def fragment(context, name, **kwargs):
+    """Персональная часть страницы.
+
+    На страницах из общего кеша выводит метку для FragmentMiddleware,
+    на остальных сразу рендерит includes/fragments/<name>.html.
+    """
+    if context.get('defer_fragments'):
+        return mark_safe(make_marker(name, **kwargs))
+    fragment_template = context.template.engine.get_template(
+        FRAGMENT_TEMPLATE.format(name)
+    )
+    with context.push(**kwargs):
+        return fragment_template.render(context)
@@ -0,0 +1,127 @@
+from io import BytesIO
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import (
+    StopUpload,
+    TemporaryFileUploadHandler)
+from django.template.defaultfilters import filesizeformat
+from PIL import Image, UnidentifiedImageError
+
+from blog.constants import (
+    IMAGE_MAX_PIXELS,
+    IMAGE_UPLOAD_FORMATS,
+    IMAGE_UPLOAD_MAX_SIZE)
+
+
+class RejectedUpload(UploadedFile):
+    """Файл, приём которого прерван из-за размера.
+
+    Подставляется в файлы формы вместо загрузки, чтобы поле показало
+    ошибку размера, а не сочло фото отсутствующим.
+    """
+
+    truncated = True
+
+    def __init__(self, name, size):
+        super().__init__(BytesIO(), name, size=size)
+
+
+class LimitedUploadHandler(TemporaryFileUploadHandler):
+    """Пишет каждый загружаемый файл во временный файл на диске.
+
+    Как только файл превышает max_size, разбор запроса прекращается
+    без чтения остатка тела, а в request.rejected_uploads
+    запоминается отклонённое поле.
+    """
+
+    max_size = IMAGE_UPLOAD_MAX_SIZE
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.request.rejected_uploads = {
+                **getattr(self.request, 'rejected_uploads', {}),
+                self.field_name: RejectedUpload(
+                    self.file_name, self.received
+                ),
+            }
+            raise StopUpload(connection_reset=True)
+        return super().receive_data_chunk(raw_data, start)
+
+
+def get_request_files(request):
+    """request.FILES вместе с загрузками, отклонёнными из-за размера."""
+    files = request.FILES
+    rejected = getattr(request, 'rejected_uploads', None)
+    if rejected:
+        files = files.copy()
+        files.update(rejected)
+    return files
+
+
+def read_image_header(file):
+    """Формат и размеры изображения по заголовку, без декодирования."""
+    with Image.open(file) as image:
+        return image.format, image.size
+
+
+class ImageUploadField(forms.ImageField):
+    """Поле фото, которое не декодирует изображение целиком.
+
+    Проверяет только заголовок: формат и число пикселей, поэтому
+    «декомпрессионная бомба» отклоняется до того, как её распакуют.
+    """
+
+    default_error_messages = {
+        'too_large': 'Файл больше %(limit)s.',
+        'too_many_pixels': (
+            'Изображение слишком большое: допускается не больше '
+            '%(limit)s мегапикселей.'
+        ),
+    }
+
+    def reject_pixels(self):
+        raise ValidationError(
+            self.error_messages['too_many_pixels'],
+            code='too_many_pixels',
+            params={'limit': IMAGE_MAX_PIXELS // 10 ** 6},
+        )
+
+    def to_python(self, data):
+        file = forms.FileField.to_python(self, data)
+        if file is None:
+            return None
+        if getattr(file, 'truncated', False):
+            raise ValidationError(
+                self.error_messages['too_large'],
+                code='too_large',
+                params={
+                    'limit': filesizeformat(LimitedUploadHandler.max_size)
+                },
+            )
+        if hasattr(file, 'temporary_file_path'):
+            source = file.temporary_file_path()
+        else:
+            source = file
+        try:
+            image_format, (width, height) = read_image_header(source)
+        except Image.DecompressionBombError:
+            self.reject_pixels()
+        except (OSError, UnidentifiedImageError):
+            image_format = None
+        if image_format not in IMAGE_UPLOAD_FORMATS:
+            raise ValidationError(
+                self.error_messages['invalid_image'], code='invalid_image'
+            )
+        if width * height > IMAGE_MAX_PIXELS:
+            self.reject_pixels()
+        file.content_type = Image.MIME.get(image_format)
+        if hasattr(file, 'seek') and callable(file.seek):
+            file.seek(0)
+        return file
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from django.template import engines
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+from blog.constants import EXCERPT_MAX_LENGTH, EXCERPT_WORDS
+
+
+def render_excerpt(text):
+    excerpt = Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+    return Truncator(excerpt).chars(EXCERPT_MAX_LENGTH)
+
+
+def render_text_html(text):
+    return linebreaksbr(text, autoescape=True)
+
+
+def iter_template_names():
+    """Имена всех шаблонов из каталогов DIRS каждого движка."""
+    for engine in engines.all():
+        for directory in engine.dirs:
+            directory = Path(directory)
+            for path in sorted(directory.rglob('*.html')):
+                yield engine, path.relative_to(directory).as_posix()
+
+
+def precompile_templates():
+    """Разбирает все шаблоны, чтобы их закешировал cached.Loader.
+
+    Ошибки синтаксиса выбрасываются сразу, а не на первом запросе.
+    """
+    names = []
+    for engine, name in iter_template_names():
+        engine.get_template(name)
+        names.append(name)
+    return names
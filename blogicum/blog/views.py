@@ -1,9 +1,7 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
-from django.http import Http404
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from django.utils import timezone
 from django.views.generic import (
     ListView,
     DetailView,
@@ -11,52 +9,79 @@ from django.views.generic import (
     UpdateView,
     DeleteView)
 
-from blog.constants import PAGINATION
+from blog.constants import FEED_MAX_AGE, PAGINATION, POST_MAX_AGE
 from blog.forms import PostForm, CommentForm
-from blog.mixins import DispatchMixin
+from blog.mixins import (
+    CacheControlMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    DispatchMixin,
+    RelatedObjectMixin,
+    TemplateEngineMixin,
+    UploadFormMixin)
 from blog.models import Category, Post, Comment
 from blog.models import User
 
 
-class IndexListView(ListView):
+class IndexListView(CacheControlMixin, ConditionalGetMixin,
+                    TemplateEngineMixin, CursorPaginationMixin, ListView):
     """Выводит главную страницу сайта."""
 
     model = Post
     paginate_by = PAGINATION
+    cache_max_age = FEED_MAX_AGE
+    cache_generations = ('posts', 'feed:index')
     template_name = 'blog/index.html'
 
     def get_queryset(self):
-        return (Post.objects.annotate(comment_count=Count('comments')).filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True).order_by('-pub_date')).select_related(
-                'author', 'location', 'category')
+        return Post.objects.published().with_card_data()
 
+    def get_last_modified_queryset(self):
+        return Post.objects.published()
 
-class UserListView(ListView):
+    def get_count_key(self):
+        return 'index'
+
+
+class UserListView(CacheControlMixin, ConditionalGetMixin,
+                   TemplateEngineMixin, RelatedObjectMixin,
+                   CursorPaginationMixin, ListView):
     model = Post
+    related_model = User
+    related_field = 'username'
+    related_url_kwarg = 'username'
     paginate_by = PAGINATION
+    cache_max_age = FEED_MAX_AGE
     ordering = '-pub_date'
     template_name = 'blog/profile.html'
 
     def get_queryset(self):
-        user = get_object_or_404(User, username=self.kwargs['username'])
-        if self.request.user == user:
-            return (Post.objects.annotate(
-                comment_count=Count('comments')).filter(
-                author=user).order_by('-pub_date')).select_related(
-                'author', 'location', 'category')
-        return (Post.objects.annotate(comment_count=Count('comments')).filter(
-            author=user,
-            is_published=True,
-            pub_date__lte=timezone.now(),
-            category__is_published=True).order_by('-pub_date')).select_related(
-                'author', 'location', 'category')
+        user = self.related_object
+        posts = user.posts.all()
+        if self.request.user != user:
+            posts = posts.published()
+        return posts.with_card_data()
+
+    def get_cache_generations(self):
+        return ('posts', f'feed:author:{self.kwargs["username"]}')
+
+    def get_last_modified_queryset(self):
+        posts = Post.objects.filter(author__username=self.kwargs['username'])
+        if self.request.user.get_username() != self.kwargs['username']:
+            posts = posts.published()
+        return posts
+
+    def is_page_shared(self):
+        return self.request.user.get_username() != self.kwargs['username']
+
+    def get_count_key(self):
+        if self.request.user.get_username() == self.kwargs['username']:
+            return f'author:{self.kwargs["username"]}:all'
+        return f'author:{self.kwargs["username"]}'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = get_object_or_404(User, username=self.kwargs['username'])
-        context['profile'] = user
+        context['profile'] = self.related_object
         return context
 
 
@@ -73,7 +98,7 @@ class UserUpdateView(LoginRequiredMixin, UpdateView):
                        kwargs={'username': self.request.user})
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(LoginRequiredMixin, UploadFormMixin, CreateView):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
@@ -87,30 +112,38 @@ class PostCreateView(LoginRequiredMixin, CreateView):
                        kwargs={'username': self.request.user})
 
 
-class PostDetailView(DetailView):
+class PostDetailView(CacheControlMixin, ConditionalGetMixin,
+                     TemplateEngineMixin, DetailView):
     model = Post
+    cache_max_age = POST_MAX_AGE
     pk_field = 'post_id'
     pk_url_kwarg = 'post_id'
     template_name = 'blog/detail.html'
 
-    def get_object(self):
-        post = super().get_object()
-        user = self.request.user
-        if user != post.author and (post.pub_date > timezone.now()
-                                    or post.is_published is False
-                                    or post.category.is_published is False):
-            raise Http404
-        return super().get_object()
+    def get_cache_generations(self):
+        return ('posts', f'post:{self.kwargs["post_id"]}')
+
+    def can_store_page(self):
+        return self.object.is_public
+
+    def get_queryset(self):
+        return Post.objects.visible_to(self.request.user).select_related(
+            'author', 'location', 'category')
+
+    def get_last_modified_queryset(self):
+        return Post.objects.visible_to(self.request.user).filter(
+            pk=self.kwargs['post_id']
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.get_object(
-        ).comments.select_related('author')
+        context['comments'] = self.object.comments.select_related('author')
         return context
 
 
-class PostUpdateView(LoginRequiredMixin, DispatchMixin, UpdateView):
+class PostUpdateView(LoginRequiredMixin, DispatchMixin, UploadFormMixin,
+                     UpdateView):
     model = Post
     form_class = PostForm
     pk_url_kwarg = 'post_id'
@@ -128,6 +161,7 @@ class PostDeleteView(LoginRequiredMixin, DispatchMixin, DeleteView):
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
     pk_field = 'post_id'
+    queryset = Post.objects.select_related('location')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -141,26 +175,38 @@ class PostDeleteView(LoginRequiredMixin, DispatchMixin, DeleteView):
                        kwargs={'username': self.request.user})
 
 
-class CategoryListView(ListView):
+class CategoryListView(CacheControlMixin, ConditionalGetMixin,
+                       TemplateEngineMixin, RelatedObjectMixin,
+                       CursorPaginationMixin, ListView):
     model = Post
+    related_model = Category
+    related_field = 'slug'
+    related_url_kwarg = 'category_slug'
     template_name = 'blog/category.html'
     ordering = '-pub_date'
     paginate_by = PAGINATION
+    cache_max_age = FEED_MAX_AGE
+
+    def get_related_queryset(self):
+        return Category.objects.filter(is_published=True)
 
     def get_queryset(self):
-        category = get_object_or_404(Category,
-                                     slug=self.kwargs['category_slug'],
-                                     is_published=True)
-        return (Post.objects.annotate(comment_count=Count('comments')).filter(
-            category=category,
-            is_published=True,
-            pub_date__lte=timezone.now()).order_by(
-                '-pub_date')).select_related('author', 'location', 'category')
+        return self.related_object.posts.published().with_card_data()
+
+    def get_cache_generations(self):
+        return ('posts', f'feed:category:{self.kwargs["category_slug"]}')
+
+    def get_last_modified_queryset(self):
+        return Post.objects.published().filter(
+            category__slug=self.kwargs['category_slug']
+        )
+
+    def get_count_key(self):
+        return f'category:{self.kwargs["category_slug"]}'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = Category.objects.get(
-            slug=self.kwargs['category_slug'], is_published=True)
+        context['category'] = self.related_object
         return context
 
 
@@ -172,7 +218,8 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        return super().form_valid(form)
+        with transaction.atomic():
+            return super().form_valid(form)
 
     def get_success_url(self):
         return reverse('blog:post_detail',
@@ -0,0 +1,48 @@
+from django.templatetags.static import static
+from django.template.defaultfilters import date, linebreaksbr
+from django.urls import reverse
+from django.utils.timezone import localtime
+from django_bootstrap5.templatetags.django_bootstrap5 import (
+    bootstrap_button,
+    bootstrap_css,
+    bootstrap_form)
+from jinja2 import Environment, pass_context
+from markupsafe import Markup
+
+from blog.fragments import make_marker, render_fragment
+
+
+def url(viewname, *args, **kwargs):
+    return reverse(viewname, args=args or None, kwargs=kwargs or None)
+
+
+def local_date(value, arg=None):
+    """Фильтр date из шаблонов Django с переводом во время сайта."""
+    if value in (None, ''):
+        return ''
+    if getattr(value, 'tzinfo', None) is not None:
+        value = localtime(value)
+    return date(value, arg)
+
+
+@pass_context
+def fragment(context, name, **kwargs):
+    """Аналог тега {% fragment %} из blog_fragments."""
+    if context.get('defer_fragments'):
+        return Markup(make_marker(name, **kwargs))
+    return Markup(render_fragment(context['request'], name, **kwargs))
+
+
+def environment(**options):
+    env = Environment(**options)
+    env.globals.update({
+        'url': url,
+        'static': static,
+        'bootstrap_css': bootstrap_css,
+        'bootstrap_form': bootstrap_form,
+        'bootstrap_button': bootstrap_button,
+        'fragment': fragment,
+    })
+    env.filters['date'] = local_date
+    env.filters['linebreaksbr'] = linebreaksbr
+    return env
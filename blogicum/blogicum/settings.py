@@ -1,3 +1,4 @@
+from importlib.util import find_spec
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -32,6 +33,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.middleware.SessionlessAnonymousMiddleware',
+    'blog.middleware.FragmentMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
@@ -55,6 +58,23 @@ TEMPLATES = [
     },
 ]
 
+if find_spec('jinja2') is not None:
+    TEMPLATES.append({
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [BASE_DIR / 'jinja2'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'blogicum.jinja2.environment',
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+            ],
+        },
+    })
+
+# Движок для лент и страницы публикации: 'django' или 'jinja2'.
+BLOG_TEMPLATE_ENGINE = 'django'
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
@@ -108,6 +128,12 @@ LOGIN_URL = 'login'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_URL = '/media/'
+
+# Загрузки сразу пишутся на диск и обрезаются после
+# blog.constants.IMAGE_UPLOAD_MAX_SIZE.
+FILE_UPLOAD_HANDLERS = ['blog.uploads.LimitedUploadHandler']
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -115,3 +141,28 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 ALLOWED_HOSTS = [
     '127.0.0.1',
 ]
+
+BLOG_FEED_COUNT_STRATEGY = 'blog.paginators.CachedCount'
+
+BLOG_FEED_POST_CARDS = True
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+BLOG_PAGE_CACHE_ENABLED = False
+
+BLOG_PAGE_CACHE_STALE_WHILE_REVALIDATE = False
+
+BLOG_FRAGMENTS_ENABLED = False
+
+BLOG_PRECOMPILE_TEMPLATES = False
+
+# Кто отдаёт байты медиафайлов: None — сам Django,
+# 'x-accel-redirect' — nginx, 'x-sendfile' — Apache/lighttpd.
+BLOG_MEDIA_OFFLOAD = None
+
+# Префикс internal-location nginx, которая смотрит в MEDIA_ROOT.
+BLOG_MEDIA_ACCEL_PREFIX = '/protected-media/'
@@ -0,0 +1,49 @@
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar.')
+]
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+    *TEMPLATES[1:],
+]
+
+# Блокировка пересборки страниц (blog.cache.acquire_lock) держится на
+# cache.add(), поэтому нужен кеш с атомарным add(), общий для всех
+# процессов: memcached или redis. У FileBasedCache add() не атомарен,
+# и страницу пересобирают сразу несколько запросов.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': '127.0.0.1:11211',
+    }
+}
+
+BLOG_PAGE_CACHE_ENABLED = True
+
+BLOG_PAGE_CACHE_STALE_WHILE_REVALIDATE = True
+
+BLOG_FRAGMENTS_ENABLED = True
+
+BLOG_PRECOMPILE_TEMPLATES = True
+
+BLOG_MEDIA_OFFLOAD = 'x-accel-redirect'
@@ -3,6 +3,7 @@ import re
 import time
 from http import HTTPStatus
 from inspect import getsource
+from io import BytesIO
 from pathlib import Path
 from typing import (Any, Iterable, List, NamedTuple, Optional, Tuple, Type,
                     TypeVar, Union)
@@ -10,12 +11,14 @@ from typing import (Any, Iterable, List, NamedTuple, Optional, Tuple, Type,
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.files.images import ImageFile
 from django.db.models import Field, Model
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
 from mixer.backend.django import mixer as _mixer
+from PIL import Image
 
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
@@ -124,6 +127,27 @@ def another_user_client(another_user):
     return client
 
 
+@pytest.fixture
+def media_root(tmp_path):
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
+
+
+def make_image(name, size=(800, 600), color=(73, 109, 137)):
+    img_io = BytesIO()
+    Image.new("RGB", size, color=color).save(img_io, format="JPEG")
+    return ImageFile(img_io, name=name)
+
+
+def get_urls(post):
+    return (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+
+
 def get_post_list_context_key(
         user_client, page_url, page_load_err_msg, key_missing_msg
 ):
@@ -354,6 +378,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
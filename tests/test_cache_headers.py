@@ -0,0 +1,36 @@
+import pytest
+
+from conftest import get_urls
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_pages_are_public(
+        post_with_published_location, unlogged_client
+):
+    for url in get_urls(post_with_published_location):
+        response = unlogged_client.get(url)
+        assert "Cookie" not in response.get("Vary", ""), (
+            f"Убедитесь, что ответ `{url}` анонимному посетителю"
+            " не зависит от cookie."
+        )
+        assert not response.cookies, (
+            f"Убедитесь, что ответ `{url}` анонимному посетителю"
+            " не устанавливает cookie сессии и CSRF."
+        )
+        cache_control = response.get("Cache-Control", "")
+        assert "public" in cache_control and "max-age" in cache_control, (
+            f"Убедитесь, что страница `{url}` для анонимного посетителя"
+            " отдаётся с заголовком Cache-Control: public, max-age."
+        )
+
+
+def test_logged_in_pages_are_private(
+        post_with_published_location, user_client
+):
+    for url in get_urls(post_with_published_location):
+        response = user_client.get(url)
+        assert "private" in response.get("Cache-Control", ""), (
+            f"Убедитесь, что страница `{url}` авторизованного пользователя"
+            " не сохраняется в общих кешах."
+        )
@@ -0,0 +1,64 @@
+import pytest
+from django.core.cache import cache
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("clear_cache"),
+]
+
+
+@pytest.fixture
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_only_changed_card_is_rendered(
+        mixer: Mixer, post_with_published_location, unlogged_client
+):
+    other_post = mixer.blend(
+        "blog.Post",
+        is_published=True,
+        category=post_with_published_location.category,
+        pub_date=post_with_published_location.pub_date,
+    )
+    unlogged_client.get("/")
+    # update() не меняет updated_at: карточка должна остаться из кеша.
+    Post.objects.filter(pk=other_post.pk).update(title="Без новой версии")
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    content = unlogged_client.get("/").content.decode()
+    assert "Новый заголовок" in content, (
+        "Убедитесь, что карточка изменённой публикации собирается заново."
+    )
+    assert other_post.title in content, (
+        "Убедитесь, что карточки неизменённых публикаций берутся из кеша."
+    )
+    assert "Без новой версии" not in content
+
+
+def test_card_follows_category_and_location_flags(
+        post_with_published_location, user, user_client
+):
+    profile_url = f"/profile/{user.username}/"
+    location = post_with_published_location.location
+    assert location.name in user_client.get(profile_url).content.decode()
+    location.is_published = False
+    location.save()
+    content = user_client.get(profile_url).content.decode()
+    assert location.name not in content, (
+        "Убедитесь, что снятие места с публикации меняет ключ кеша"
+        " карточки."
+    )
+    category = post_with_published_location.category
+    category.is_published = False
+    category.save()
+    content = user_client.get(profile_url).content.decode()
+    assert "Выбранная категория снята с публикации админом" in content, (
+        "Убедитесь, что снятие категории с публикации меняет ключ кеша"
+        " карточки."
+    )
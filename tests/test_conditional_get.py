@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from conftest import get_urls
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_unchanged_pages_return_not_modified(
+        post_with_published_location, unlogged_client
+):
+    for url in get_urls(post_with_published_location):
+        response = unlogged_client.get(url)
+        assert response.has_header("ETag") and response.has_header(
+            "Last-Modified"
+        ), f"Убедитесь, что страница `{url}` отдаёт ETag и Last-Modified."
+        with CaptureQueriesContext(connection) as queries:
+            response = unlogged_client.get(
+                url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        assert response.status_code == 304, (
+            f"Убедитесь, что неизменившаяся страница `{url}` отдаётся"
+            " с кодом 304."
+        )
+        assert len(queries) == 1, (
+            f"Убедитесь, что для ответа 304 на `{url}` выполняется только"
+            f" запрос времени изменения, а не {len(queries)}."
+        )
+
+
+def test_changed_pages_return_full_response(
+        post_with_published_location, unlogged_client
+):
+    post = post_with_published_location
+    etags = {url: unlogged_client.get(url)["ETag"] for url in get_urls(post)}
+    post.title = "Новый заголовок"
+    post.save()
+    for url, etag in etags.items():
+        response = unlogged_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f"Убедитесь, что после изменения публикации страница `{url}`"
+            " отдаётся заново."
+        )
+
+
+def test_etag_differs_for_logged_in_user(
+        post_with_published_location, unlogged_client, user_client
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = unlogged_client.get(url)["ETag"]
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что страница, закешированная для анонимного"
+        " посетителя, не подтверждается ответом 304 после входа."
+    )
+
+
+def test_deleted_post_changes_last_modified(
+        mixer, post_with_published_location, unlogged_client
+):
+    post = post_with_published_location
+    mixer.blend(
+        "blog.Post", is_published=True, category=post.category,
+        pub_date=post.pub_date,
+    )
+    an_hour_ago = timezone.now() - timedelta(hours=1)
+    Post.objects.update(updated_at=an_hour_ago, pub_date=an_hour_ago)
+    cache.clear()
+    last_modified = unlogged_client.get("/")["Last-Modified"]
+    post.delete()
+    response = unlogged_client.get("/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200, (
+        "Убедитесь, что удаление публикации меняет Last-Modified ленты."
+    )
@@ -0,0 +1,34 @@
+from base64 import urlsafe_b64encode
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_cursor(raw):
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("raw", (
+    "2024-01-01T00:00:00+00:00|9223372036854775808",
+    "2024-01-01T00:00:00+00:00|-9223372036854775809",
+    "2024-01-01T00:00:00|1",
+    "не курсор",
+))
+def test_forged_cursor_returns_404(
+        post_with_published_location, unlogged_client, raw
+):
+    response = unlogged_client.get(f"/?after={make_cursor(raw)}")
+    assert response.status_code == 404, (
+        "Убедитесь, что лента с подделанным курсором `?after=` отвечает"
+        " статусом 404."
+    )
+
+
+def test_valid_cursor_is_accepted(
+        post_with_published_location, unlogged_client
+):
+    response = unlogged_client.get(
+        f"/?after={make_cursor('2024-01-01T00:00:00+00:00|1')}"
+    )
+    assert response.status_code == 200
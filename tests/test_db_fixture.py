@@ -0,0 +1,40 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_shipped_fixture_loads():
+    call_command(
+        "loaddata", settings.BASE_DIR / "db.json", stdout=StringIO()
+    )
+    assert Post.objects.exists()
+    assert not Post.objects.filter(updated_at__isnull=True).exists(), (
+        "Убедитесь, что публикации из фикстуры без `updated_at`"
+        " загружаются с заполненным временем изменения."
+    )
+    assert not Post.objects.filter(excerpt="").exists() and not (
+        Post.objects.filter(text_html="").exists()
+    ), (
+        "Убедитесь, что при загрузке фикстуры у публикаций заполняются"
+        " начало текста и HTML-текст."
+    )
+
+
+@pytest.mark.django_db
+def test_backfill_post_text_touches_updated_at(post_with_published_location):
+    an_hour_ago = timezone.now() - timedelta(hours=1)
+    Post.objects.update(excerpt="", updated_at=an_hour_ago)
+    call_command("backfill_post_text", stdout=StringIO())
+    post = Post.objects.get()
+    assert post.excerpt
+    assert post.updated_at > an_hour_ago, (
+        "Убедитесь, что backfill_post_text обновляет `updated_at`, чтобы"
+        " сбросить кеш карточки."
+    )
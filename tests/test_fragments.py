@@ -0,0 +1,96 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("enable_fragments"),
+]
+
+
+@pytest.fixture
+def enable_fragments():
+    cache.clear()
+    with override_settings(
+            BLOG_PAGE_CACHE_ENABLED=True, BLOG_FRAGMENTS_ENABLED=True
+    ):
+        yield
+    cache.clear()
+
+
+def test_shared_page_gets_personal_fragments(
+        post_with_published_location, unlogged_client, user_client,
+        another_user_client, another_user
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    edit_url = f"/posts/{post.id}/edit/"
+    anonymous = unlogged_client.get(url).content.decode()
+    author = user_client.get(url).content.decode()
+    reader = another_user_client.get(url).content.decode()
+    for content in (anonymous, author, reader):
+        assert "<!--fragment:" not in content, (
+            "Убедитесь, что FragmentMiddleware заменяет все метки"
+            " фрагментов на странице."
+        )
+    assert edit_url in author and post.author.username in author, (
+        "Убедитесь, что автор видит на общей странице из кеша свои кнопки"
+        " и своё имя в шапке."
+    )
+    assert edit_url not in reader and another_user.username in reader, (
+        "Убедитесь, что другой пользователь не видит кнопки автора"
+        " на общей странице из кеша."
+    )
+    assert "Войти" in anonymous and edit_url not in anonymous
+
+
+def test_logged_in_users_share_cached_page(
+        post_with_published_location, user_client, another_user_client
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    user_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = another_user_client.get(url)
+    assert response.status_code == 200
+    assert not any(
+        "blog_comment" in query["sql"] for query in queries.captured_queries
+    ), (
+        "Убедитесь, что страница из общего кеша отдаётся авторизованному"
+        " пользователю без выборки публикации и комментариев."
+    )
+
+
+def test_unpublished_post_is_not_shared(
+        post_with_published_location, user_client, unlogged_client
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    url = f"/posts/{post.id}/"
+    assert user_client.get(url).status_code == 200
+    assert unlogged_client.get(url).status_code == 404, (
+        "Убедитесь, что страница снятой с публикации записи, открытая"
+        " автором, не попадает в общий кеш."
+    )
+
+
+def test_author_etag_is_not_shared_after_logout(
+        post_with_published_location, unlogged_client, user_client
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    anonymous_etag = unlogged_client.get(url)["ETag"]
+    response = user_client.get(url)
+    assert response["ETag"] != anonymous_etag, (
+        "Убедитесь, что страница из общего кеша отдаётся автору"
+        " со своим ETag, а не с ETag анонимного посетителя."
+    )
+    assert not response.has_header("Last-Modified")
+    user_client.logout()
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200, (
+        "Убедитесь, что после выхода ETag страницы автора не"
+        " подтверждается ответом 304."
+    )
+    assert "/edit/" not in response.content.decode()
@@ -0,0 +1,190 @@
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.utils import timezone
+from mixer.backend.django import Mixer
+from PIL import Image
+
+from blog.models import ImageJob, Post
+from conftest import make_image
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("media_root"),
+]
+
+
+def process_image_jobs():
+    call_command(
+        "process_image_jobs", "--once", "--workers", "1", stdout=StringIO()
+    )
+
+
+@pytest.fixture
+def pending_post(mixer: Mixer, user, published_location, published_category):
+    return mixer.blend(
+        "blog.Post",
+        is_published=True,
+        location=published_location,
+        category=published_category,
+        author=user,
+        image=make_image("large_image.jpg"),
+    )
+
+
+@pytest.fixture
+def post_with_large_image(pending_post):
+    process_image_jobs()
+    pending_post.refresh_from_db()
+    return pending_post
+
+
+def test_upload_is_processed_by_queue(pending_post, unlogged_client):
+    assert pending_post.image_variants == {}, (
+        "Убедитесь, что копии фото создаются не при сохранении публикации,"
+        " а обработчиком очереди."
+    )
+    assert pending_post.image_jobs.get().status == "pending"
+    content = unlogged_client.get("/").content.decode()
+    assert "image_placeholder.svg" in content, (
+        "Убедитесь, что до обработки фото в ленте выводится заглушка."
+    )
+    process_image_jobs()
+    assert pending_post.image_jobs.get().status == "done"
+
+
+def test_variants_created_on_upload(post_with_large_image, media_root):
+    variants = post_with_large_image.image_variants
+    assert (variants["width"], variants["height"]) == (800, 600)
+    for key, extension in (("fallback", ".jpg"), ("webp", ".webp")):
+        assert [item["width"] for item in variants[key]] == [320, 640, 800], (
+            "Убедитесь, что для фото создаются копии фиксированной ширины,"
+            " не превышающей исходную."
+        )
+        for item in variants[key]:
+            assert item["name"].endswith(extension)
+            with Image.open(media_root / item["name"]) as variant:
+                assert variant.size == (item["width"], item["height"])
+
+
+def test_feed_uses_responsive_image(post_with_large_image, unlogged_client):
+    content = unlogged_client.get("/").content.decode()
+    for attribute in (
+            'type="image/webp"', "srcset=", 'width="800"', 'height="600"',
+            'loading="lazy"'
+    ):
+        assert attribute in content, (
+            "Убедитесь, что в ленте фото выводится с атрибутами srcset,"
+            " width, height, loading и WebP-вариантом."
+        )
+
+
+def test_img_size_matches_src_variant(
+        pending_post, unlogged_client
+):
+    pending_post.image = make_image("wide_image.jpg", size=(2000, 1333))
+    pending_post.save()
+    process_image_jobs()
+    content = unlogged_client.get("/").content.decode()
+    assert 'width="1280" height="853"' in content, (
+        "Убедитесь, что width и height у <img> берутся у копии фото,"
+        " указанной в src, а не у исходного файла."
+    )
+
+
+def test_replaced_image_discards_old_job(pending_post):
+    pending_post.image = make_image("new_image.jpg", size=(400, 300))
+    pending_post.save()
+    process_image_jobs()
+    pending_post.refresh_from_db()
+    variants = pending_post.image_variants
+    assert variants["source"] == pending_post.image.name, (
+        "Убедитесь, что копии старого фото не записываются в публикацию"
+        " после замены фото."
+    )
+    assert (variants["width"], variants["height"]) == (400, 300)
+
+
+def test_unreadable_image_falls_back_to_original(
+        pending_post, media_root, unlogged_client
+):
+    (media_root / pending_post.image.name).write_bytes(b"not an image")
+    process_image_jobs()
+    pending_post.refresh_from_db()
+    assert pending_post.responsive_image is None
+    assert not pending_post.image_pending
+    content = unlogged_client.get("/").content.decode()
+    assert pending_post.image.url in content
+
+
+def test_images_uploaded_before_queue_are_enqueued(pending_post):
+    pending_post.image_jobs.all().delete()
+    migration = import_module("blog.migrations.0013_enqueue_existing_images")
+    migration.enqueue_existing_images(apps, None)
+    process_image_jobs()
+    pending_post.refresh_from_db()
+    assert not pending_post.image_pending, (
+        "Убедитесь, что фото, загруженные до появления очереди, тоже"
+        " попадают в неё и перестают показываться заглушкой."
+    )
+
+
+@pytest.mark.parametrize(
+    "attempts, status", [(1, "done"), (3, "failed")]
+)
+def test_abandoned_job_is_reclaimed(pending_post, attempts, status):
+    job = pending_post.image_jobs.get()
+    job.status = "processing"
+    job.attempts = attempts
+    job.claimed_at = timezone.now() - timedelta(hours=1)
+    job.save()
+    process_image_jobs()
+    job.refresh_from_db()
+    assert job.status == status, (
+        "Убедитесь, что задача, брошенная упавшим обработчиком,"
+        " забирается снова, пока не исчерпаны попытки."
+    )
+    pending_post.refresh_from_db()
+    assert not pending_post.image_pending
+
+
+def test_post_is_not_saved_without_its_job(
+        mixer: Mixer, user, published_category, monkeypatch
+):
+    def broken_get_or_create(*args, **kwargs):
+        raise RuntimeError("queue is down")
+
+    monkeypatch.setattr(
+        ImageJob.objects, "get_or_create", broken_get_or_create
+    )
+    with pytest.raises(RuntimeError):
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            image=make_image("large_image.jpg"),
+        )
+    assert not Post.objects.exists(), (
+        "Убедитесь, что публикация с фото и задача на его обработку"
+        " сохраняются в одной транзакции."
+    )
+
+
+def test_rebuilt_variants_survive_gc_media(pending_post, media_root):
+    call_command("build_image_variants", stdout=StringIO())
+    pending_post.refresh_from_db()
+    variants = pending_post.image_variants
+    names = [
+        item["name"] for key in ("fallback", "webp") for item in variants[key]
+    ]
+    assert names
+    call_command("gc_media", "--min-age", "0", stdout=StringIO())
+    for name in [pending_post.image.name, *names]:
+        assert (media_root / name).exists(), (
+            "Убедитесь, что команда `build_image_variants` учитывает"
+            " ссылки на копии фото и `gc_media` их не удаляет."
+        )
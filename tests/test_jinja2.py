@@ -0,0 +1,29 @@
+import pytest
+from django.test import override_settings
+
+pytest.importorskip("jinja2")
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(BLOG_TEMPLATE_ENGINE="jinja2")
+def test_jinja2_pages_render(
+        post_with_published_location, comment_to_a_post, user_client
+):
+    post = post_with_published_location
+    for url in (
+            "/",
+            f"/category/{post.category.slug}/",
+            f"/profile/{post.author.username}/",
+            f"/posts/{post.id}/",
+    ):
+        response = user_client.get(url)
+        assert response.status_code == 200, (
+            f"Убедитесь, что страница `{url}` отрисовывается движком Jinja2"
+            " без ошибок."
+        )
+        assert post.title in response.content.decode(), (
+            f"Убедитесь, что шаблон Jinja2 для `{url}` выводит публикацию."
+        )
+    detail = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert comment_to_a_post.text.splitlines()[0] in detail
@@ -0,0 +1,84 @@
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+from blog.models import MediaBlob
+from conftest import make_image
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("media_root"),
+]
+
+
+def gc_media(*args):
+    out = StringIO()
+    call_command("gc_media", "--min-age", "0", *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def make_post(mixer: Mixer, user, published_location, published_category):
+    def make(image):
+        return mixer.blend(
+            "blog.Post",
+            is_published=True,
+            location=published_location,
+            category=published_category,
+            author=user,
+            image=image,
+        )
+
+    return make
+
+
+def test_identical_uploads_share_file(make_post, media_root):
+    first = make_post(make_image("first.jpg"))
+    second = make_post(make_image("second.JPG"))
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые файлы сохраняются под одним именем."
+    )
+    assert first.image.name.startswith("blogicum_images/")
+    assert first.image.name.endswith(".jpg")
+    files = [
+        name for _, _, names in os.walk(media_root) for name in names
+    ]
+    assert len(files) == 1, (
+        "Убедитесь, что повторная загрузка не создаёт копию файла."
+    )
+    assert MediaBlob.objects.get(name=first.image.name).ref_count == 2
+
+
+def test_replaced_image_is_collected(make_post, media_root):
+    post = make_post(make_image("old.jpg"))
+    shared = make_post(make_image("shared.jpg", color=(1, 2, 3)))
+    old_name = post.image.name
+    post.image = make_image("new.jpg", color=(200, 10, 10))
+    post.save()
+    assert MediaBlob.objects.get(name=old_name).ref_count == 0
+    stray = media_root / "blogicum_images" / "stray.jpg"
+    stray.write_bytes(b"stray")
+
+    gc_media("--dry-run")
+    assert (media_root / old_name).exists(), (
+        "Убедитесь, что с `--dry-run` команда `gc_media` ничего не удаляет."
+    )
+    gc_media("--batch-size", "1")
+    assert not (media_root / old_name).exists(), (
+        "Убедитесь, что `gc_media` удаляет файл, на который больше не "
+        "ссылается ни одна публикация."
+    )
+    assert not stray.exists()
+    assert (media_root / post.image.name).exists()
+    assert (media_root / shared.image.name).exists()
+    assert not MediaBlob.objects.filter(name=old_name).exists()
+
+    post.delete()
+    gc_media()
+    assert not (media_root / post.image.name).exists(), (
+        "Убедитесь, что после удаления публикации её фото удаляется."
+    )
+    assert (media_root / shared.image.name).exists()
@@ -0,0 +1,87 @@
+import pytest
+from django.test import override_settings
+
+HASH = "ab" * 32
+
+
+@pytest.fixture(autouse=True)
+def media_root(media_root):
+    (media_root / "blogicum_images" / "ab").mkdir(parents=True)
+    (media_root / "blogicum_images" / "ab" / f"{HASH}.jpg").write_bytes(
+        bytes(range(256)) * 4
+    )
+    (media_root / "blogicum_images" / "legacy.jpg").write_bytes(b"legacy")
+    with override_settings(BLOG_MEDIA_OFFLOAD=None):
+        yield media_root
+
+
+HASHED_URL = f"/media/blogicum_images/ab/{HASH}.jpg"
+
+
+def content(response):
+    return b"".join(response.streaming_content)
+
+
+def test_hashed_file_is_immutable(client):
+    response = client.get(HASHED_URL)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/jpeg"
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хешем в имени кешируются как неизменяемые."
+    )
+    assert response["ETag"] == f'"{HASH}"'
+    response = client.get(HASHED_URL, HTTP_IF_NONE_MATCH=f'"{HASH}"')
+    assert response.status_code == 304, (
+        "Убедитесь, что при совпадении If-None-Match возвращается 304."
+    )
+    response = client.get("/media/blogicum_images/legacy.jpg")
+    assert "immutable" not in response["Cache-Control"]
+    assert content(response) == b"legacy"
+
+
+@pytest.mark.parametrize(
+    "header, status, expected",
+    [
+        ("bytes=0-9", 206, bytes(range(10))),
+        ("bytes=1020-", 206, bytes(range(252, 256))),
+        ("bytes=-2", 206, bytes((254, 255))),
+        ("bytes=0-1,5-6", 200, bytes(range(256)) * 4),
+        ("bytes=5000-", 416, None),
+    ],
+    ids=["start-end", "open-end", "suffix", "multiple", "unsatisfiable"],
+)
+def test_range_requests(client, header, status, expected):
+    response = client.get(HASHED_URL, HTTP_RANGE=header)
+    assert response.status_code == status, (
+        f"Убедитесь, что на Range: {header} возвращается {status}."
+    )
+    if expected is not None:
+        assert content(response) == expected
+    if status == 206:
+        assert response["Content-Range"].endswith("/1024")
+
+
+@pytest.mark.parametrize(
+    "offload, header, value",
+    [
+        ("x-accel-redirect", "X-Accel-Redirect",
+         f"/protected-media/blogicum_images/ab/{HASH}.jpg"),
+        ("x-sendfile", "X-Sendfile", None),
+    ],
+)
+def test_offload(client, media_root, offload, header, value):
+    with override_settings(BLOG_MEDIA_OFFLOAD=offload):
+        response = client.get(HASHED_URL)
+    assert response.status_code == 200
+    assert response.content == b"", (
+        "Убедитесь, что в режиме выгрузки Django не отдаёт байты файла."
+    )
+    expected = value or str(media_root / f"blogicum_images/ab/{HASH}.jpg")
+    assert response[header] == expected
+    assert "immutable" in response["Cache-Control"]
+
+
+def test_missing_and_outside_files(client):
+    assert client.get("/media/blogicum_images/missing.jpg").status_code == 404
+    assert client.get("/media/../manage.py").status_code == 404
+    assert client.get("/media/blogicum_images").status_code == 404
@@ -0,0 +1,232 @@
+import re
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.cache import (
+    acquire_lock, get_generation, get_metrics, get_stale_page_key,
+    release_lock)
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("enable_page_cache"),
+]
+
+
+@pytest.fixture
+def enable_page_cache():
+    cache.clear()
+    with override_settings(BLOG_PAGE_CACHE_ENABLED=True):
+        yield
+    cache.clear()
+
+
+def get_content_and_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return response.content.decode(), len(queries)
+
+
+def test_anonymous_pages_are_cached(
+        post_with_published_location, unlogged_client
+):
+    for url in (
+            "/",
+            f"/posts/{post_with_published_location.id}/",
+            f"/category/{post_with_published_location.category.slug}/",
+    ):
+        first_content, _ = get_content_and_queries(unlogged_client, url)
+        content, n_queries = get_content_and_queries(unlogged_client, url)
+        assert n_queries == 0, (
+            f"Убедитесь, что повторный запрос анонимного посетителя к `{url}`"
+            " отдаётся из кеша без обращений к базе данных."
+        )
+        assert content == first_content
+
+
+def test_publish_invalidates_cached_pages(
+        mixer: Mixer, post_with_published_location, unlogged_client
+):
+    get_content_and_queries(unlogged_client, "/")
+    new_post = mixer.blend(
+        "blog.Post",
+        is_published=True,
+        category=post_with_published_location.category,
+        pub_date=post_with_published_location.pub_date,
+    )
+    content, _ = get_content_and_queries(unlogged_client, "/")
+    assert new_post.title in content, (
+        "Убедитесь, что новая публикация сразу появляется на главной"
+        " странице, даже если страница была закеширована."
+    )
+
+
+def test_logged_in_pages_are_not_cached(
+        post_with_published_location, user_client
+):
+    get_content_and_queries(user_client, "/")
+    _, n_queries = get_content_and_queries(user_client, "/")
+    assert n_queries > 0, (
+        "Убедитесь, что страницы для авторизованных пользователей"
+        " не отдаются из общего кеша."
+    )
+
+
+def test_post_change_keeps_other_feeds_cached(
+        mixer: Mixer, post_with_published_location, another_category,
+        unlogged_client
+):
+    other_post = mixer.blend(
+        "blog.Post",
+        is_published=True,
+        category=another_category,
+        pub_date=post_with_published_location.pub_date,
+    )
+    other_url = f"/category/{another_category.slug}/"
+    url = f"/category/{post_with_published_location.category.slug}/"
+    for page in (url, other_url, f"/posts/{other_post.id}/"):
+        get_content_and_queries(unlogged_client, page)
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    for page in (other_url, f"/posts/{other_post.id}/"):
+        _, n_queries = get_content_and_queries(unlogged_client, page)
+        assert n_queries == 0, (
+            "Убедитесь, что изменение публикации сбрасывает кеш только"
+            " тех лент, в которые она попадает."
+        )
+    content, _ = get_content_and_queries(unlogged_client, url)
+    assert "Новый заголовок" in content
+
+
+def test_comment_keeps_feed_counts(
+        mixer: Mixer, post_with_published_location, user
+):
+    counts = get_generation("counts")
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    user.first_name = "Новое имя"
+    user.save()
+    post_with_published_location.location.save()
+    assert get_generation("counts") == counts, (
+        "Убедитесь, что комментарии, авторы и места не сбрасывают"
+        " закешированное число записей в лентах."
+    )
+    post_with_published_location.category.save()
+    assert get_generation("counts") != counts
+
+
+@override_settings(BLOG_PAGE_CACHE_STALE_WHILE_REVALIDATE=True)
+def test_stale_page_served_while_regenerating(
+        mixer: Mixer, post_with_published_location, unlogged_client
+):
+    get_content_and_queries(unlogged_client, "/")
+    new_post = mixer.blend(
+        "blog.Post",
+        is_published=True,
+        category=post_with_published_location.category,
+        pub_date=post_with_published_location.pub_date,
+    )
+    key = get_stale_page_key(RequestFactory().get("/"))
+    token = acquire_lock(key)
+    assert token
+    content, _ = get_content_and_queries(unlogged_client, "/")
+    assert new_post.title not in content, (
+        "Убедитесь, что пока страницу пересобирает другой запрос,"
+        " посетителю отдаётся устаревшая копия."
+    )
+    release_lock(key, token)
+    content, _ = get_content_and_queries(unlogged_client, "/")
+    assert new_post.title in content, (
+        "Убедитесь, что первый запрос после изменения данных"
+        " пересобирает страницу."
+    )
+    _, n_queries = get_content_and_queries(unlogged_client, "/")
+    assert n_queries == 0
+    assert get_metrics() == {
+        "hit": 1, "miss": 1, "stale": 1, "regeneration": 1
+    }, "Убедитесь, что кеш страниц ведёт счётчики обращений."
+
+
+@override_settings(BLOG_PAGE_CACHE_STALE_WHILE_REVALIDATE=True)
+def test_cold_miss_respects_foreign_lock(
+        post_with_published_location, unlogged_client, monkeypatch
+):
+    monkeypatch.setattr("blog.cache.PAGE_LOCK_WAIT", 0.1)
+    key = get_stale_page_key(RequestFactory().get("/"))
+    token = acquire_lock(key)
+    get_content_and_queries(unlogged_client, "/")
+    assert acquire_lock(key) is None, (
+        "Убедитесь, что запрос без блокировки не снимает чужую"
+        " блокировку пересборки страницы."
+    )
+    assert cache.get(key) is None, (
+        "Убедитесь, что страницу сохраняет только владелец блокировки."
+    )
+    release_lock(key, token)
+    get_content_and_queries(unlogged_client, "/")
+    _, n_queries = get_content_and_queries(unlogged_client, "/")
+    assert n_queries == 0
+
+
+def test_warm_cache_fills_page_cache(
+        post_with_published_location, unlogged_client
+):
+    call_command("warm_cache", stdout=StringIO())
+    for url in ("/", f"/posts/{post_with_published_location.id}/"):
+        _, n_queries = get_content_and_queries(unlogged_client, url)
+        assert n_queries == 0, (
+            f"Убедитесь, что команда warm_cache сохраняет страницу `{url}`"
+            " в кеш."
+        )
+
+
+def test_warm_cache_fills_next_page_links(
+        mixer: Mixer, post_with_published_location, unlogged_client
+):
+    mixer.cycle(12).blend(
+        "blog.Post",
+        is_published=True,
+        category=post_with_published_location.category,
+        pub_date=post_with_published_location.pub_date,
+    )
+    call_command("warm_cache", "--pages", "2", stdout=StringIO())
+    content, _ = get_content_and_queries(unlogged_client, "/")
+    cursor = re.search(r'href="\?after=([^"]+)"', content).group(1)
+    _, n_queries = get_content_and_queries(
+        unlogged_client, f"/?after={cursor}"
+    )
+    assert n_queries == 0, (
+        "Убедитесь, что warm_cache заполняет кеш для ссылки «дальше»"
+        " вида `?after=`, по которой переходят посетители."
+    )
+
+
+@override_settings(BLOG_PAGE_CACHE_STALE_WHILE_REVALIDATE=True)
+def test_stale_page_dropped_when_regeneration_fails(
+        post_with_published_location, unlogged_client, monkeypatch
+):
+    monkeypatch.setattr("blog.cache.PAGE_LOCK_WAIT", 0.1)
+    url = f"/posts/{post_with_published_location.id}/"
+    get_content_and_queries(unlogged_client, url)
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    assert unlogged_client.get(url).status_code == 404
+    key = get_stale_page_key(RequestFactory().get(url))
+    assert cache.get(key) is None, (
+        "Убедитесь, что устаревшая копия страницы удаляется, если новую"
+        " страницу нельзя сохранить в кеш."
+    )
+    token = acquire_lock(key)
+    assert unlogged_client.get(url).status_code == 404, (
+        "Убедитесь, что снятая с публикации запись не отдаётся из кеша,"
+        " пока страницу пересобирает другой запрос."
+    )
+    release_lock(key, token)
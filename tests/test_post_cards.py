@@ -0,0 +1,45 @@
+import pytest
+from django.test import override_settings
+
+from blog.bench import DUMMY_CACHES
+from blog.cards import PostCard
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("disable_fragment_cache"),
+]
+
+
+@pytest.fixture
+def disable_fragment_cache():
+    with override_settings(CACHES=DUMMY_CACHES):
+        yield
+
+
+def get_feed_urls(post):
+    return (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+
+
+def test_feeds_render_post_cards(post_with_published_location, user_client):
+    for url in get_feed_urls(post_with_published_location):
+        response = user_client.get(url)
+        posts = list(response.context["page_obj"])
+        assert posts and all(isinstance(post, PostCard) for post in posts), (
+            f"Убедитесь, что лента `{url}` строится из объектов PostCard."
+        )
+
+
+def test_post_cards_render_same_html(
+        post_with_published_location, unlogged_client
+):
+    for url in get_feed_urls(post_with_published_location):
+        with override_settings(BLOG_FEED_POST_CARDS=False):
+            expected = unlogged_client.get(url).content
+        assert unlogged_client.get(url).content == expected, (
+            f"Убедитесь, что карточки ленты `{url}` из PostCard выглядят"
+            " так же, как из экземпляров модели."
+        )
@@ -0,0 +1,87 @@
+import pytest
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+# Включая запрос MAX(), по которому проверяется условный GET.
+DETAIL_QUERIES_UNLOGGED = 3
+DETAIL_QUERIES_LOGGED = 5
+LIST_QUERIES_UNLOGGED = 4
+EDIT_POST_QUERIES = 5
+DELETE_QUERIES = 3
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return len(queries)
+
+
+@pytest.mark.parametrize("n_comments", [1, 10])
+def test_post_detail_query_budget(
+        mixer: Mixer, post_with_published_location, user_client,
+        unlogged_client, n_comments
+):
+    mixer.cycle(n_comments).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    url = f"/posts/{post_with_published_location.id}/"
+    for client, expected in (
+            (unlogged_client, DETAIL_QUERIES_UNLOGGED),
+            (user_client, DETAIL_QUERIES_LOGGED),
+    ):
+        n_queries = count_queries(client, url)
+        assert n_queries == expected, (
+            f"Убедитесь, что страница публикации выполняет {expected}"
+            f" запроса к базе данных независимо от числа комментариев,"
+            f" а не {n_queries}."
+        )
+
+
+@override_settings(BLOG_FEED_COUNT_STRATEGY="blog.paginators.ExactCount")
+def test_profile_and_category_query_budget(
+        many_posts_with_published_locations, user, published_category,
+        unlogged_client
+):
+    for url, page_name in (
+            (f"/profile/{user.username}/", "страница пользователя"),
+            (f"/category/{published_category.slug}/", "страница категории"),
+    ):
+        n_queries = count_queries(unlogged_client, url)
+        assert n_queries == LIST_QUERIES_UNLOGGED, (
+            f"Убедитесь, что {page_name} выполняет"
+            f" {LIST_QUERIES_UNLOGGED} запроса к базе данных: объект"
+            " страницы должен запрашиваться один раз, а не"
+            f" {n_queries}."
+        )
+
+
+def test_edit_and_delete_query_budget(comment_to_a_post):
+    post = comment_to_a_post.post
+    post_author_client = Client()
+    post_author_client.force_login(post.author)
+    comment_author_client = Client()
+    comment_author_client.force_login(comment_to_a_post.author)
+    comment_url = f"/posts/{post.id}/{{}}/{comment_to_a_post.id}/"
+    for client, url, expected in (
+            (post_author_client, f"/posts/{post.id}/edit/",
+             EDIT_POST_QUERIES),
+            (post_author_client, f"/posts/{post.id}/delete/",
+             DELETE_QUERIES),
+            (comment_author_client, comment_url.format("edit_comment"),
+             DELETE_QUERIES),
+            (comment_author_client, comment_url.format("delete_comment"),
+             DELETE_QUERIES),
+    ):
+        n_queries = count_queries(client, url)
+        assert n_queries == expected, (
+            f"Убедитесь, что страница `{url}` запрашивает изменяемый объект"
+            f" из базы данных один раз: ожидалось {expected} запросов,"
+            f" выполнено {n_queries}."
+        )
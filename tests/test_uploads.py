@@ -0,0 +1,106 @@
+import struct
+import zlib
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from PIL import Image
+
+from blog.forms import PostForm
+from blog.models import Post
+from blog.uploads import LimitedUploadHandler, get_request_files
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures("media_root"),
+]
+
+
+def png_chunk(kind, data):
+    return (
+        struct.pack(">I", len(data)) + kind + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def make_png_header(width, height):
+    """PNG в несколько байт, заголовок которого обещает width×height."""
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2,
+                                         0, 0, 0))
+        + png_chunk(b"IDAT", zlib.compress(b""))
+        + png_chunk(b"IEND", b"")
+    )
+
+
+def make_jpeg(size=(40, 30)):
+    buffer = BytesIO()
+    Image.new("RGB", size).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def make_form(content, published_category):
+    return PostForm(
+        data={
+            "title": "Фото",
+            "text": "Текст",
+            "pub_date": "2024-01-01T00:00",
+            "category": published_category.pk,
+        },
+        files={"image": SimpleUploadedFile("photo.png", content)},
+    )
+
+
+def test_decompression_bomb_rejected_by_header(published_category):
+    form = make_form(make_png_header(8000, 8000), published_category)
+    assert not form.is_valid()
+    assert "мегапикселей" in form.errors["image"][0], (
+        "Убедитесь, что фото с огромным числом пикселей отклоняется по"
+        " заголовку, без распаковки."
+    )
+    form = make_form(make_jpeg(), published_category)
+    assert form.is_valid(), form.errors
+
+
+def test_oversized_upload_is_rejected(
+    user_client, published_category, monkeypatch
+):
+    monkeypatch.setattr(LimitedUploadHandler, "max_size", 1024)
+    response = user_client.post(
+        "/posts/create/",
+        data={
+            "title": "Фото",
+            "text": "Текст",
+            "pub_date": "2024-01-01T00:00",
+            "category": published_category.pk,
+            "image": SimpleUploadedFile(
+                "photo.jpg", make_jpeg().ljust(4096, b"\0")
+            ),
+        },
+    )
+    assert response.status_code == 200
+    assert "Файл больше" in response.context["form"].errors["image"][0], (
+        "Убедитесь, что слишком большой файл отклоняется с понятной"
+        " ошибкой."
+    )
+    assert not Post.objects.exists()
+
+
+def test_oversized_upload_stops_reading_body(monkeypatch):
+    monkeypatch.setattr(LimitedUploadHandler, "max_size", 1024)
+    body = encode_multipart(BOUNDARY, {
+        "image": SimpleUploadedFile("photo.jpg", b"\0" * 2 ** 20),
+    })
+    request = RequestFactory().generic(
+        "POST", "/", body, content_type=MULTIPART_CONTENT
+    )
+    request.upload_handlers = [LimitedUploadHandler(request)]
+    files = get_request_files(request)
+    assert files["image"].truncated
+    assert request._stream.remaining > 2 ** 19, (
+        "Убедитесь, что после превышения предела остаток тела запроса"
+        " не читается."
+    )